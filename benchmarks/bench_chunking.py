@@ -0,0 +1,90 @@
+# MCP_PROJECT/benchmarks/bench_chunking.py
+"""
+Scaling benchmark for utils.document_utils.chunk_text.
+
+Builds a synthetic corpus of N pages and times the offset/binary-search
+chunker against the previous page x chunk substring scan.
+
+    python -m benchmarks.bench_chunking --pages 250 500 1000 2000 4000
+"""
+
+import argparse
+import json
+import random
+import time
+from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from utils.document_utils import chunk_text
+
+WORDS = ("agent retrieval generation vector index embedding context query model "
+         "latency pipeline document chunk token answer reasoning memory tool").split()
+
+
+def make_corpus(pages, files=4, words_per_page=350, seed=0):
+    """Synthetic multi-file corpus of `pages` pages with paragraph breaks."""
+    rng = random.Random(seed)
+    documents = []
+    per_file = max(1, pages // files)
+    for i in range(pages):
+        paragraphs = []
+        for _ in range(3):
+            paragraphs.append(" ".join(rng.choice(WORDS) for _ in range(words_per_page // 3)) + ".")
+        documents.append(Document(
+            page_content="\n\n".join(paragraphs) + "\n",
+            metadata={"source": f"file_{i // per_file}.pdf", "page": i % per_file, "page_label": str(i % per_file + 1)},
+        ))
+    return documents
+
+
+def legacy_chunk_text(documents, chunk_size, chunk_overlap):
+    """The previous implementation: split the concatenated text, then scan every page for every chunk."""
+    full_text = "".join(doc.page_content for doc in documents)
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", " ", ""], length_function=len
+    )
+    raw_chunks = text_splitter.split_text(full_text)
+    chunks = []
+    for doc in documents:
+        for chunk in raw_chunks:
+            if chunk in doc.page_content or chunk[:50] in doc.page_content:
+                chunks.append({"text": chunk.strip(), "metadata": {"source": doc.metadata["source"]}})
+    return chunks
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[250, 500, 1000, 2000, 4000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--legacy-max-pages", type=int, default=1000,
+                        help="Skip the quadratic legacy chunker above this many pages")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'pages':>6} {'chunks':>7} {'chunk_text (s)':>15} {'legacy (s)':>11} {'legacy chunks':>14}")
+    for pages in args.pages:
+        documents = make_corpus(pages)
+        seconds, chunks = timed(chunk_text, documents, args.chunk_size, args.chunk_overlap)
+        row = {"pages": pages, "chunks": len(chunks), "seconds": seconds}
+        if pages <= args.legacy_max_pages:
+            legacy_seconds, legacy_chunks = timed(legacy_chunk_text, documents, args.chunk_size, args.chunk_overlap)
+            row.update(legacy_seconds=legacy_seconds, legacy_chunks=len(legacy_chunks))
+        results.append(row)
+        print(f"{pages:>6} {len(chunks):>7} {seconds:>15.3f} "
+              f"{row.get('legacy_seconds', float('nan')):>11.3f} {row.get('legacy_chunks', '-'):>14}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "chunking", "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
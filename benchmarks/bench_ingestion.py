@@ -0,0 +1,81 @@
+# MCP_PROJECT/benchmarks/bench_ingestion.py
+"""
+Offline ingestion throughput: load_pdf -> chunk_text -> upsert_data_to_pinecone.
+
+Embeddings and Pinecone are replaced by fakes with injected latency, so the
+numbers show how the pipeline overlaps upstream calls rather than how fast
+OpenAI is today. `--copies` replicates the corpus under new source names to
+scale it up.
+
+    python -m benchmarks.bench_ingestion --copies 20 --embed-ms 80 --output ingestion.json
+"""
+
+import argparse
+import time
+from benchmarks.fakes import add_latency_arguments, configure_environment, install_fakes, latencies_from_args
+from benchmarks.common import write_results
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def replicate(documents, copies):
+    """The corpus `copies` times over, each copy under its own source name."""
+    from langchain_core.documents import Document
+    if copies <= 1:
+        return documents
+    return [
+        Document(page_content=doc.page_content, metadata={**doc.metadata, "source": f"{doc.metadata.get('source', '')}#{copy}"})
+        for copy in range(copies) for doc in documents
+    ]
+
+
+def run(copies=1, latencies=None, embedding_cache=False):
+    configure_environment(EMBEDDING_CACHE_ENABLED=str(embedding_cache).lower())
+    fakes = install_fakes(latencies)
+    from utils import config
+    from utils.document_utils import load_pdf, chunk_text
+    from vector_store.pinecone_db import upsert_data_to_pinecone
+
+    load_seconds, documents = timed(load_pdf, config.DOCUMENTS_DIR)
+    documents = replicate(documents, copies)
+    chunk_seconds, chunks = timed(chunk_text, documents, config.CHUNK_SIZE, config.CHUNK_OVERLAP)
+    upsert_seconds, sync = timed(upsert_data_to_pinecone, chunks, fakes["pinecone"], force=True)
+    resync_seconds, resync = timed(upsert_data_to_pinecone, chunks, fakes["pinecone"])
+
+    return {
+        "pages": len(documents),
+        "chunks": len(chunks),
+        "load_pdf_seconds": load_seconds,
+        "chunk_text_seconds": chunk_seconds,
+        "upsert_seconds": upsert_seconds,
+        "upsert_chunks_per_second": sync["added"] / upsert_seconds if upsert_seconds else 0.0,
+        "embedding_requests": fakes["embeddings"].calls,
+        "unchanged_resync_seconds": resync_seconds,
+        "unchanged_resync_added": resync["added"],
+        "total_seconds": load_seconds + chunk_seconds + upsert_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=1, help="Replicate the documents folder this many times")
+    parser.add_argument("--embedding-cache", action="store_true", help="Keep the embedding cache in the path")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    latencies = latencies_from_args(args)
+    results = run(args.copies, latencies, args.embedding_cache)
+    for key, value in results.items():
+        print(f"{key:>26}: {value:.3f}" if isinstance(value, float) else f"{key:>26}: {value}")
+    if args.output:
+        write_results(args.output, "ingestion", results,
+                      {"copies": args.copies, "embedding_cache": args.embedding_cache, **vars(latencies)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# MCP_PROJECT/benchmarks/bench_llm_client.py
+"""
+Per-call overhead of the summarization client against a local stub server.
+
+Compares building a fresh ChatOpenAI + prompt chain on every call (the old
+summarize_with_llm) with the shared, connection-pooled Summarizer. The stub
+answers instantly, so the numbers are pure client/setup/connection overhead.
+
+    python -m benchmarks.bench_llm_client --calls 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [{"index": 0, "finish_reason": "stop",
+                 "message": {"role": "assistant", "content": "stub answer"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3},
+}
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Minimal /v1/chat/completions endpoint with HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle delay the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        StubOpenAIHandler.connections.add(self.client_address)
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps(COMPLETION).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def summarize_per_call(base_url, question, context):
+    """The previous behaviour: new model client and chain for every request."""
+    from langchain_openai import ChatOpenAI
+    from utils.openai_call import PROMPT
+    llm = ChatOpenAI(model="gpt-4o", temperature=0, base_url=base_url, api_key="stub")
+    return (PROMPT | llm).invoke({"question": question, "context": context}).content
+
+
+def summarize_shared(summarizer, question, context):
+    return summarizer.summarize(question, context)
+
+
+def measure(fn, calls):
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "calls": calls,
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": statistics.median(timings),
+        "p95_ms": statistics.quantiles(timings, n=20)[18] if calls >= 20 else max(timings),
+    }
+
+
+async def measure_async(summarizer, calls, question, context):
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await summarizer.asummarize(question, context)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"calls": calls, "mean_ms": statistics.mean(timings), "p50_ms": statistics.median(timings)}
+
+
+def run(calls=200):
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    from utils.openai_call import Summarizer
+
+    server, base_url = start_stub_server()
+    question, context = "What is RAG?", "Retrieval-Augmented Generation combines retrieval with generation."
+    try:
+        StubOpenAIHandler.connections.clear()
+        per_call = measure(lambda: summarize_per_call(base_url, question, context), calls)
+        per_call["connections"] = len(StubOpenAIHandler.connections)
+
+        StubOpenAIHandler.connections.clear()
+        summarizer = Summarizer(base_url=base_url)
+        shared = measure(lambda: summarize_shared(summarizer, question, context), calls)
+        shared["connections"] = len(StubOpenAIHandler.connections)
+
+        shared_async = asyncio.run(measure_async(summarizer, calls, question, context))
+    finally:
+        server.shutdown()
+
+    return {"benchmark": "llm_client", "per_call_client": per_call, "shared_client": shared,
+            "shared_client_async": shared_async}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.calls)
+    for name in ("per_call_client", "shared_client", "shared_client_async"):
+        row = results[name]
+        print(f"{name:>20}: mean {row['mean_ms']:.2f} ms  p50 {row['p50_ms']:.2f} ms"
+              + (f"  connections {row['connections']}" if "connections" in row else ""))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
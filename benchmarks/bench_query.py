@@ -0,0 +1,88 @@
+# MCP_PROJECT/benchmarks/bench_query.py
+"""
+Offline single-query latency, broken down by pipeline stage.
+
+Runs document_retrieval_tool (and the summary-free retrieve_chunks_tool)
+sequentially against the fake embeddings / LLM / Pinecone and reports
+end-to-end latency next to the per-stage histograms recorded by
+utils.metrics (embed, search, generate, upstream waits, ...). The answer
+cache is off unless --answer-cache is given, so every call runs the full
+pipeline.
+
+    python -m benchmarks.bench_query --iterations 50 --output query.json
+"""
+
+import argparse
+import asyncio
+import time
+from benchmarks.fakes import add_latency_arguments, configure_environment, install_fakes, latencies_from_args
+from benchmarks.common import latency_summary, write_results
+
+QUERIES = [
+    "What is Retrieval-Augmented Generation?",
+    "What are the main types of AI agents?",
+    "How does the retriever interact with the generator in RAG?",
+    "What ethical concerns do AI agents raise?",
+    "What are the current challenges of RAG systems?",
+    "How do learning agents improve over time?",
+]
+
+
+async def measure(tool, iterations, **kwargs):
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        await tool(QUERIES[i % len(QUERIES)], **kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+    return latency_summary(timings)
+
+
+def run(iterations=30, latencies=None, answer_cache=False):
+    configure_environment(ANSWER_CACHE_ENABLED=str(answer_cache).lower())
+    install_fakes(latencies)
+    from utils.metrics import metrics
+    from utils.retriever import retriever
+    from tools.document_retrieval import document_retrieval_tool, retrieve_chunks_tool
+
+    warm_up_start = time.perf_counter()
+    retriever.warm_up()
+    warm_up_seconds = time.perf_counter() - warm_up_start
+
+    metrics.reset()
+    summarized = asyncio.run(measure(document_retrieval_tool, iterations))
+    stages = metrics.snapshot()["latency"]
+
+    metrics.reset()
+    retrieval_only = asyncio.run(measure(retrieve_chunks_tool, iterations))
+
+    return {
+        "warm_up_seconds": warm_up_seconds,
+        "document_retrieval_tool": summarized,
+        "retrieve_chunks_tool": retrieval_only,
+        "stages": stages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--answer-cache", action="store_true", help="Leave the answer cache enabled")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    latencies = latencies_from_args(args)
+    results = run(args.iterations, latencies, args.answer_cache)
+    print(f"{'':>28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'count':>6}")
+    rows = [("document_retrieval_tool", results["document_retrieval_tool"]),
+            ("retrieve_chunks_tool", results["retrieve_chunks_tool"])]
+    rows += [(f"  {name}", summary) for name, summary in sorted(results["stages"].items())]
+    for name, row in rows:
+        print(f"{name:>28} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['count']:>6}")
+    if args.output:
+        write_results(args.output, "query", results,
+                      {"iterations": args.iterations, "answer_cache": args.answer_cache, **vars(latencies)})
+
+
+if __name__ == "__main__":
+    main()
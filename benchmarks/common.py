@@ -0,0 +1,39 @@
+# MCP_PROJECT/benchmarks/common.py
+
+import json
+import math
+import platform
+import time
+
+
+def latency_summary(timings_ms: list[float]) -> dict:
+    """Count, mean and nearest-rank p50/p95/p99/max of a list of millisecond timings."""
+    if not timings_ms:
+        return {"count": 0}
+    ordered = sorted(timings_ms)
+
+    def percentile(q):
+        return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": ordered[-1],
+    }
+
+
+def write_results(path: str, benchmark: str, results: dict, parameters: dict = None):
+    """Write results as JSON with enough context to compare runs."""
+    payload = {
+        "benchmark": benchmark,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "parameters": parameters or {},
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
@@ -0,0 +1,232 @@
+# MCP_PROJECT/benchmarks/fakes.py
+"""
+Offline stand-ins for every network dependency of the RAG pipeline.
+
+Each fake sleeps for a configurable latency so benchmarks can model a real
+deployment without API keys or network access:
+
+    FakeEmbeddings        OpenAI embeddings (deterministic hashed vectors)
+    FakeSummarizer        the shared gpt-4o Summarizer (streams canned tokens)
+    FakePineconeIndex     a Pinecone index (in-memory cosine search)
+    FakeSearchBackend     DuckDuckGo (from utils.search_client)
+
+`configure_environment()` must run before anything imports `utils.config`;
+`install_fakes()` then swaps the fakes into the shared singletons.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+@dataclass
+class Latencies:
+    """Injected latency per upstream call, in seconds."""
+    embed: float = 0.05          # one embeddings request
+    embed_per_text: float = 0.0  # extra per text in a batch
+    llm_first_token: float = 0.3
+    llm_per_token: float = 0.01
+    vector_query: float = 0.02
+    vector_upsert: float = 0.05
+    web_search: float = 0.5
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic unit vectors seeded by the text hash; same text, same vector."""
+
+    def __init__(self, dimension: int = 1536, latency: float = 0.0, latency_per_text: float = 0.0):
+        self.dimension = dimension
+        self.latency = latency
+        self.latency_per_text = latency_per_text
+        self.calls = 0
+        self.texts = 0
+
+    def _vector(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def _delay(self, count):
+        return self.latency + self.latency_per_text * count
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        self.texts += len(texts)
+        time.sleep(self._delay(len(texts)))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts):
+        self.calls += 1
+        self.texts += len(texts)
+        await asyncio.sleep(self._delay(len(texts)))
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text):
+        return (await self.aembed_documents([text]))[0]
+
+
+class FakeSummarizer:
+    """Summarizer stand-in: waits for the first token, then streams `tokens` words."""
+
+    def __init__(self, first_token_latency: float = 0.0, per_token_latency: float = 0.0, tokens: int = 40):
+        self.first_token_latency = first_token_latency
+        self.per_token_latency = per_token_latency
+        self.tokens = tokens
+        self.calls = 0
+
+    def _words(self, question):
+        words = f"Offline answer to: {question}.".split()
+        return (words * (self.tokens // len(words) + 1))[:self.tokens]
+
+    def summarize(self, question, context):
+        self.calls += 1
+        time.sleep(self.first_token_latency + self.per_token_latency * self.tokens)
+        return " ".join(self._words(question))
+
+    async def asummarize(self, question, context):
+        return "".join([token async for token in self.astream(question, context)])
+
+    async def astream(self, question, context):
+        self.calls += 1
+        await asyncio.sleep(self.first_token_latency)
+        for word in self._words(question):
+            yield word + " "
+            if self.per_token_latency:
+                await asyncio.sleep(self.per_token_latency)
+
+    async def astream_batch(self, questions, context, mode):
+        async for token in self.astream(questions, context):
+            yield token
+
+
+class _Matches:
+    def __init__(self, matches):
+        self.matches = matches
+
+
+class _Stats:
+    def __init__(self, total):
+        self.total_vector_count = total
+
+
+@dataclass
+class _ScoredVector:
+    id: str
+    score: float
+    metadata: dict
+
+
+class FakePineconeIndex:
+    """In-memory stand-in for `pinecone.Index` with the calls PineconeVectorStore makes."""
+
+    def __init__(self, query_latency: float = 0.0, upsert_latency: float = 0.0):
+        self.query_latency = query_latency
+        self.upsert_latency = upsert_latency
+        self._lock = threading.Lock()
+        self._vectors = {}
+
+    def upsert(self, vectors):
+        time.sleep(self.upsert_latency)
+        with self._lock:
+            for vector_id, values, *metadata in vectors:
+                self._vectors[vector_id] = (np.asarray(values, dtype=np.float32), metadata[0] if metadata else {})
+
+    def delete(self, ids=None, delete_all=False):
+        with self._lock:
+            if delete_all:
+                self._vectors.clear()
+            for vector_id in ids or []:
+                self._vectors.pop(vector_id, None)
+
+    def query(self, vector, top_k, include_metadata=True):
+        time.sleep(self.query_latency)
+        with self._lock:
+            items = list(self._vectors.items())
+        if not items:
+            return _Matches([])
+        matrix = np.stack([values for _, (values, _) in items])
+        query = np.asarray(vector, dtype=np.float32)
+        scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0))
+        top = np.argsort(-scores)[:top_k]
+        return _Matches([_ScoredVector(items[i][0], float(scores[i]), items[i][1][1]) for i in top])
+
+    def describe_index_stats(self):
+        return _Stats(len(self._vectors))
+
+
+def configure_environment(state_dir: str = None, **overrides) -> str:
+    """
+    Point every on-disk cache at a scratch directory and select offline backends.
+
+    Must run before `utils.config` is imported. Extra keyword arguments are
+    set as environment variables (e.g. ANSWER_CACHE_ENABLED="false").
+
+    Returns:
+        str: The scratch directory.
+    """
+    state_dir = state_dir or tempfile.mkdtemp(prefix="mcp-bench-")
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+    os.environ.setdefault("PINECONE_API_KEY", "offline")
+    os.environ["CACHE_DIR"] = state_dir
+    os.environ["INDEX_MANIFEST_PATH"] = os.path.join(state_dir, "index_manifest.json")
+    os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(state_dir, "embeddings.sqlite3")
+    os.environ["VECTOR_STORE_BACKEND"] = "pinecone"
+    os.environ["WEB_SEARCH_BACKEND"] = "fake"
+    os.environ.update({key: str(value) for key, value in overrides.items()})
+    return state_dir
+
+
+def install_fakes(latencies: Latencies = None) -> dict:
+    """
+    Replace the shared OpenAI, Pinecone and DuckDuckGo clients with fakes.
+
+    Returns:
+        dict: The installed fakes by name, for call counts.
+    """
+    latencies = latencies or Latencies()
+    import utils.openai_call
+    import utils.retriever
+    import utils.search_client
+    import vector_store.ingestion
+    import vector_store.pinecone_db
+    from utils.embedding_cache import CachedEmbeddings
+
+    fakes = {
+        "embeddings": FakeEmbeddings(latency=latencies.embed, latency_per_text=latencies.embed_per_text),
+        "summarizer": FakeSummarizer(latencies.llm_first_token, latencies.llm_per_token),
+        "pinecone": FakePineconeIndex(latencies.vector_query, latencies.vector_upsert),
+        "web_search": utils.search_client.FakeSearchBackend(latencies.web_search),
+    }
+
+    shared = utils.retriever.embeddings
+    if isinstance(shared, CachedEmbeddings):
+        # Keep the cache in the path, as in production
+        shared.underlying = fakes["embeddings"]
+    else:
+        utils.retriever.embeddings = fakes["embeddings"]
+        vector_store.ingestion.embeddings = fakes["embeddings"]
+    vector_store.pinecone_db.create_pinecone_index = lambda: fakes["pinecone"]
+    utils.openai_call._summarizer = fakes["summarizer"]
+    utils.search_client._search_client = utils.search_client.SearchClient(fakes["web_search"])
+    return fakes
+
+
+def add_latency_arguments(parser):
+    """Add --<name>-latency options (in milliseconds) for every field of Latencies."""
+    defaults = Latencies()
+    for field in Latencies.__dataclass_fields__:
+        parser.add_argument(f"--{field.replace('_', '-')}-ms", type=float, default=getattr(defaults, field) * 1000,
+                            help=f"Injected latency: {field} (ms)")
+
+
+def latencies_from_args(args) -> Latencies:
+    return Latencies(**{field: getattr(args, f"{field}_ms") / 1000 for field in Latencies.__dataclass_fields__})
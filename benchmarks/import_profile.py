@@ -0,0 +1,153 @@
+# MCP_PROJECT/benchmarks/import_profile.py
+"""
+Server cold start: import-time profile and time to a first `list_tools`.
+
+Three measurements, each in fresh interpreters so nothing is cached in-process:
+
+  * `python -X importtime -c "import server"`, reporting the modules with the
+    largest cumulative and self import time;
+  * which heavy dependencies `import server` loads (they should all be
+    deferred to first use or the background warm-up);
+  * `server.py --transport stdio` spawned as an MCP client would, timing
+    process start to `initialize`, the first `list_tools` and a warm one.
+
+    python -m benchmarks.import_profile --runs 5 --top 25 --output startup.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from benchmarks.fakes import configure_environment
+from benchmarks.common import latency_summary, write_results
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Should not be imported until a tool needs them
+HEAVY_DEPENDENCIES = [
+    "langchain_openai", "langchain_core", "langchain_text_splitters", "openai", "pinecone",
+    "duckduckgo_search", "numpy", "faiss", "sentence_transformers", "fitz", "tiktoken",
+]
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Rows of `-X importtime` output as {module, depth, self_ms, cumulative_ms}."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return rows
+
+
+def profile_imports(module: str = "server", top: int = 20) -> dict:
+    """Import `module` under `-X importtime` and summarize the slowest imports."""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=PROJECT_ROOT, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    rows = parse_importtime(completed.stderr)
+    total = next((row["cumulative_ms"] for row in rows if row["module"] == module), 0.0)
+    return {
+        "module": module,
+        "import_ms": total,
+        "process_wall_ms": wall_ms,
+        "modules_imported": len(rows),
+        "top_cumulative": sorted(rows, key=lambda row: -row["cumulative_ms"])[:top],
+        "top_self": sorted(rows, key=lambda row: -row["self_ms"])[:top],
+    }
+
+
+def loaded_dependencies(module: str = "server") -> list[str]:
+    """Heavy dependencies present in sys.modules right after `import module`."""
+    code = (f"import json, sys, {module}; "
+            f"print(json.dumps([name for name in {HEAVY_DEPENDENCIES!r} if name in sys.modules]))")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+async def stdio_cold_start() -> dict:
+    """Spawn the stdio server and time initialize and list_tools, in milliseconds."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    parameters = StdioServerParameters(command=sys.executable, args=["server.py", "--transport", "stdio"],
+                                       cwd=PROJECT_ROOT, env=dict(os.environ))
+    with open(os.devnull, "w") as errlog:
+        start = time.perf_counter()
+        async with stdio_client(parameters, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                initialized = time.perf_counter()
+                tools = await session.list_tools()
+                listed = time.perf_counter()
+                await session.list_tools()
+                warm = time.perf_counter()
+    return {
+        "initialize_ms": (initialized - start) * 1000,
+        "first_list_tools_ms": (listed - initialized) * 1000,
+        "time_to_tools_ms": (listed - start) * 1000,
+        "warm_list_tools_ms": (warm - listed) * 1000,
+        "tools": len(tools.tools),
+    }
+
+
+def run(runs=5, top=20):
+    configure_environment(VECTOR_STORE_BACKEND="local")
+    profile = profile_imports("server", top)
+    deferred = loaded_dependencies("server")
+    starts = [asyncio.run(stdio_cold_start()) for _ in range(runs)]
+    return {
+        "import_profile": profile,
+        "heavy_dependencies_loaded_at_import": deferred,
+        "stdio": {
+            "tools": starts[0]["tools"] if starts else 0,
+            **{key: latency_summary([s[key] for s in starts])
+               for key in ("initialize_ms", "first_list_tools_ms", "time_to_tools_ms", "warm_list_tools_ms")},
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="stdio server spawns to time")
+    parser.add_argument("--top", type=int, default=20, help="Slowest imports to report")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.runs, args.top)
+    profile = results["import_profile"]
+    print(f"import server: {profile['import_ms']:.0f} ms ({profile['modules_imported']} modules, "
+          f"{profile['process_wall_ms']:.0f} ms process wall time)")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for row in profile["top_cumulative"]:
+        print(f"{row['cumulative_ms']:>14.1f} {row['self_ms']:>9.1f}  {'  ' * row['depth']}{row['module']}")
+    loaded = results["heavy_dependencies_loaded_at_import"]
+    print(f"\nHeavy dependencies loaded by import: {', '.join(loaded) if loaded else 'none'}")
+
+    print(f"\nstdio server, {args.runs} spawns ({results['stdio']['tools']} tools):")
+    print(f"{'':>22} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for key in ("initialize_ms", "first_list_tools_ms", "time_to_tools_ms", "warm_list_tools_ms"):
+        summary = results["stdio"][key]
+        print(f"{key[:-3]:>22} {summary['p50_ms']:>9.1f} {summary['p95_ms']:>9.1f} {summary['max_ms']:>9.1f}")
+
+    if args.output:
+        write_results(args.output, "import_profile", results, vars(args))
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
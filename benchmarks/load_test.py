@@ -0,0 +1,127 @@
+# MCP_PROJECT/benchmarks/load_test.py
+"""
+Concurrent-client load test against the real SSE server, fully offline.
+
+Starts benchmarks.offline_server (server.py with faked OpenAI, Pinecone and
+DuckDuckGo) in a subprocess, opens `--clients` MCP ClientSessions over SSE
+and has each one issue `--requests` tool calls back to back. Reports
+client-side latency percentiles, throughput and errors, plus the server's
+own per-stage metrics from /metrics.
+
+    python -m benchmarks.load_test --clients 1 8 32 --requests 10 --output load.json
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import httpx
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from benchmarks.common import latency_summary, write_results
+from benchmarks.fakes import Latencies, add_latency_arguments, latencies_from_args
+from benchmarks.bench_query import QUERIES
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def start_server(port, latencies, answer_cache):
+    """Launch the offline server and wait until it answers HTTP."""
+    command = [sys.executable, "-m", "benchmarks.offline_server", "--port", str(port)]
+    for field, value in vars(latencies).items():
+        command += [f"--{field.replace('_', '-')}-ms", str(value * 1000)]
+    if answer_cache:
+        command.append("--answer-cache")
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Offline server exited with code {process.returncode}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Offline server did not start within 60s")
+
+
+async def client_worker(url, tool, client_index, requests, timings, errors):
+    async with sse_client(url, timeout=30, sse_read_timeout=300) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            for i in range(requests):
+                query = QUERIES[(client_index + i) % len(QUERIES)]
+                start = time.perf_counter()
+                try:
+                    result = await session.call_tool(tool, {"query": query})
+                    if result.isError:
+                        errors.append(result.content[0].text if result.content else "tool error")
+                    else:
+                        timings.append((time.perf_counter() - start) * 1000)
+                except Exception as e:
+                    errors.append(str(e))
+
+
+async def run_level(url, tool, clients, requests):
+    timings, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client_worker(url, tool, c, requests, timings, errors) for c in range(clients)))
+    seconds = time.perf_counter() - start
+    return {
+        "clients": clients,
+        "requests": clients * requests,
+        "seconds": seconds,
+        "throughput_rps": len(timings) / seconds if seconds else 0.0,
+        "errors": len(errors),
+        "sample_errors": errors[:3],
+        "latency": latency_summary(timings),
+    }
+
+
+def run(client_levels, requests, tool, port, latencies=None, answer_cache=False):
+    latencies = latencies or Latencies()
+    process = start_server(port, latencies, answer_cache)
+    url = f"http://127.0.0.1:{port}/sse"
+    try:
+        # One call first so ingestion (warm-up) is not part of any measurement
+        asyncio.run(run_level(url, tool, 1, 1))
+        httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=5)
+        levels = [asyncio.run(run_level(url, tool, clients, requests)) for clients in client_levels]
+        server_metrics = httpx.get(f"http://127.0.0.1:{port}/metrics", params={"format": "json"}, timeout=5).json()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {"tool": tool, "levels": levels, "server_metrics": server_metrics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32], help="Concurrent sessions per level")
+    parser.add_argument("--requests", type=int, default=10, help="Tool calls per session")
+    parser.add_argument("--tool", default="document_retrieval_tool",
+                        choices=["document_retrieval_tool", "retrieve_chunks_tool", "web_search_tool"])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--answer-cache", action="store_true", help="Leave the answer cache enabled")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    latencies = latencies_from_args(args)
+    results = run(args.clients, args.requests, args.tool, args.port, latencies, args.answer_cache)
+    print(f"{'clients':>8} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for level in results["levels"]:
+        latency = level["latency"]
+        print(f"{level['clients']:>8} {level['throughput_rps']:>8.1f} {latency.get('p50_ms', 0):>9.1f} "
+              f"{latency.get('p95_ms', 0):>9.1f} {latency.get('p99_ms', 0):>9.1f} {level['errors']:>7}")
+    if args.output:
+        write_results(args.output, "load_test", results,
+                      {"clients": args.clients, "requests": args.requests, "tool": args.tool,
+                       "answer_cache": args.answer_cache, **vars(latencies)})
+
+
+if __name__ == "__main__":
+    main()
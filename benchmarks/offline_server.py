@@ -0,0 +1,36 @@
+# MCP_PROJECT/benchmarks/offline_server.py
+"""
+Run the real MCP server from server.py with every upstream dependency faked.
+
+Used by benchmarks.load_test; can also be started by hand to poke at the
+server without API keys:
+
+    python -m benchmarks.offline_server --port 8765 --llm-first-token-ms 500
+"""
+
+import argparse
+from benchmarks.fakes import add_latency_arguments, configure_environment, install_fakes, latencies_from_args
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--answer-cache", action="store_true", help="Leave the answer cache enabled")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    configure_environment(ANSWER_CACHE_ENABLED=str(args.answer_cache).lower())
+    install_fakes(latencies_from_args(args))
+
+    # Registers every tool, resource and route exactly as in production
+    import server
+    server.mcp.settings.host = args.host
+    server.mcp.settings.port = args.port
+    server.start_warm_up()
+    print(f"Offline MCP server on http://{args.host}:{args.port}/sse")
+    server.mcp.run(transport="sse")
+
+
+if __name__ == "__main__":
+    main()
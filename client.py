@@ -1,16 +1,16 @@
 import os
 import asyncio
 import json
+import textwrap
 from contextlib import AsyncExitStack
-from typing import Any, Dict, List, Optional
-from openai import OpenAI
-from openai.types import Completion
+from typing import Any, Dict, Optional, Tuple
 
 import nest_asyncio
 from dotenv import load_dotenv
 from mcp import ClientSession
 from mcp.client.sse import sse_client
 from openai import AsyncOpenAI
+from utils.conversation_memory import ConversationMemory
 
 # Apply nest_asyncio to allow nested event loops (needed for Jupyter/IPython)
 nest_asyncio.apply()
@@ -18,6 +18,11 @@ nest_asyncio.apply()
 # Load environment variables
 load_dotenv()
 
+# Upper bound on model -> tools -> model round trips for a single query
+MAX_TOOL_STEPS = int(os.getenv("MAX_TOOL_STEPS", "8"))
+# Seconds to wait for a single MCP tool call
+TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", "120"))
+
 
 class MCPOpenAIClient:
     """Client for interacting with OpenAI models using MCP tools."""
@@ -26,11 +31,12 @@ class MCPOpenAIClient:
         # Initialize session and client objects
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
-        self.openai = OpenAI(
+        self.openai = AsyncOpenAI(
             api_key=os.getenv("OPENAI_API_KEY")
         )
         self.available_tools = []
-        self.messages = []
+        # Token-budgeted history: old turns are trimmed, large tool results compressed
+        self.memory = ConversationMemory(model="gpt-4o-mini")
         
     async def connect_to_sse_server(self, server_url: str):
         """Connect to an MCP server running with SSE transport"""
@@ -58,45 +64,122 @@ class MCPOpenAIClient:
         if self._streams_context:
             await self._streams_context.__aexit__(None, None, None)
     
-    async def call_openai(self) -> str:
-        """Call OpenAI with the current messages and available tools"""
-        response = self.openai.chat.completions.create(
+    async def call_openai(self) -> Tuple[Dict[str, Any], str]:
+        """
+        Stream a completion for the current messages and available tools.
+
+        Content tokens are printed as they arrive and tool-call fragments are
+        reassembled, so the user sees the answer start immediately.
+
+        Returns:
+            tuple: (assistant message dict, finish_reason)
+        """
+        messages = self.memory.window()
+        print(f"\n[prompt: {self.memory.last_prompt_tokens} tokens, {len(messages)} messages]")
+        stream = await self.openai.chat.completions.create(
             model="gpt-4o-mini",
             max_tokens=1000,
-            messages=self.messages,
-            tools=self.available_tools
+            messages=messages,
+            tools=self.available_tools,
+            stream=True
         )
-        return response
-
-    async def process_openai_response(self, response: Completion) -> str:
-        """Process the response from OpenAI"""
-        for choice in response.choices:
-            if choice.finish_reason == "tool_calls":
-                # We need to include the original message and assistant response
-                self.messages.append(choice.message)
-                
-                for tool_call in choice.message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-
-                    print(f"\n[Calling tool {tool_name} with args {tool_args}]...")
-                    result = await self.session.call_tool(tool_name, tool_args)
-                    print(f"\nTool response: {result}")
-                    self.messages.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": result.content,
-                        }
-                    )
-                
-                response = await self.call_openai()
-                return await self.process_openai_response(response)
 
-            elif choice.finish_reason == "stop":
-                print("\nAssistant: " + choice.message.content)
-                return choice.message.content
-            
+        content_parts = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        finish_reason = None
+        started = False
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                if not started:
+                    print("\nAssistant: ", end="", flush=True)
+                    started = True
+                print(delta.content, end="", flush=True)
+                content_parts.append(delta.content)
+            for fragment in delta.tool_calls or []:
+                call = tool_calls.setdefault(
+                    fragment.index, {"id": "", "type": "function", "function": {"name": "", "arguments": ""}}
+                )
+                if fragment.id:
+                    call["id"] = fragment.id
+                if fragment.function and fragment.function.name:
+                    call["function"]["name"] += fragment.function.name
+                if fragment.function and fragment.function.arguments:
+                    call["function"]["arguments"] += fragment.function.arguments
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        if started:
+            print()
+
+        message: Dict[str, Any] = {"role": "assistant", "content": "".join(content_parts) or None}
+        if tool_calls:
+            message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+        return message, finish_reason
+
+    async def call_tool(self, tool_call: Dict[str, Any], show_name: bool = False) -> Dict[str, Any]:
+        """Run one tool call on the MCP server and return the matching tool message"""
+        tool_name = tool_call["function"]["name"]
+        prefix = f"[{tool_name}] " if show_name else ""
+
+        async def on_progress(progress: float, total: Optional[float], message: Optional[str]) -> None:
+            # Stage updates and streamed answer text from the server
+            if message:
+                print(prefix + message if prefix else message, end="", flush=True)
+
+        try:
+            tool_args = json.loads(tool_call["function"]["arguments"] or "{}")
+            print(f"\n[Calling tool {tool_name} with args {tool_args}]...")
+            result = await asyncio.wait_for(
+                self.session.call_tool(tool_name, tool_args, progress_callback=on_progress),
+                timeout=TOOL_CALL_TIMEOUT
+            )
+            content = "\n".join(item.text for item in result.content if hasattr(item, "text"))
+            # The answer text was already streamed via progress; just show a preview
+            print(f"\nTool response: {textwrap.shorten(content, width=300, placeholder=' ...')}")
+        except asyncio.TimeoutError:
+            content = f"Error: tool {tool_name} timed out after {TOOL_CALL_TIMEOUT:.0f}s"
+            print(f"\n{content}")
+        except Exception as e:
+            content = f"Error: tool {tool_name} failed: {e}"
+            print(f"\n{content}")
+
+        return {
+            "role": "tool",
+            "tool_call_id": tool_call["id"],
+            "content": content,
+        }
+
+    async def process_openai_response(self, message: Dict[str, Any], finish_reason: str) -> str:
+        """Process the response from OpenAI, running up to MAX_TOOL_STEPS tool rounds until the model answers"""
+        for _ in range(MAX_TOOL_STEPS):
+            if finish_reason != "tool_calls":
+                break
+
+            # We need to include the original message and assistant response
+            self.memory.append(message)
+
+            # Independent tool calls from one turn run concurrently
+            tool_calls = message["tool_calls"]
+            tool_messages = await asyncio.gather(
+                *(self.call_tool(tool_call, show_name=len(tool_calls) > 1) for tool_call in tool_calls)
+            )
+            self.memory.extend(tool_messages)
+
+            message, finish_reason = await self.call_openai()
+
+        # Also covers the reply to the last tool round
+        if finish_reason != "tool_calls":
+            content = message.get("content") or ""
+            self.memory.append({"role": "assistant", "content": content})
+            return content
+
+        content = f"Stopped after {MAX_TOOL_STEPS} tool-calling steps without a final answer."
+        print("\nAssistant: " + content)
+        return content
+
     async def get_available_tools(self):
         """Get available tools from the server"""
         print("Fetching available server tools...")
@@ -120,13 +203,13 @@ class MCPOpenAIClient:
         
     async def process_query(self, query: str) -> str:
         """Process a query using OpenAI and available tools"""
-        self.messages.append({
+        self.memory.append({
             "role": "user",
             "content": query
         })
 
-        response = await self.call_openai()
-        return await self.process_openai_response(response)
+        message, finish_reason = await self.call_openai()
+        return await self.process_openai_response(message, finish_reason)
         
     async def chat_loop(self):
         """Run an interactive chat loop"""
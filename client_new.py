@@ -7,9 +7,10 @@ from mcp.client.sse import sse_client
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
 from langchain_mcp_adapters.tools import load_mcp_tools
-from langchain_core.messages import HumanMessage, SystemMessage
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
 from langchain_core.callbacks import BaseCallbackHandler
+from utils.conversation_memory import make_pre_model_hook
+from utils.checkpointer import CompactSqliteSaver
 
 
 class PrintHandler(BaseCallbackHandler):
@@ -47,7 +48,8 @@ async def main():
     load_dotenv()
     sse_url = os.getenv("MCP_SSE_URL", "http://localhost:8050/sse")
 
-    async with sse_client(sse_url) as (read, write):
+    # Threads persist on disk as message deltas and are loaded only when resumed
+    async with sse_client(sse_url) as (read, write), CompactSqliteSaver.from_path() as memory:
         async with ClientSession(read, write) as session:
             await session.initialize()
 
@@ -77,11 +79,14 @@ async def main():
                     print(json.dumps(js_schema, indent=2))
 
             llm = ChatOpenAI(model="gpt-4o", temperature=0)
-            memory = MemorySaver()
-            agent = create_react_agent(llm, tools, checkpointer=memory)
+            # Trim/compress what is sent to the model each step; the checkpoint keeps the full thread
+            agent = create_react_agent(llm, tools, checkpointer=memory, pre_model_hook=make_pre_model_hook(model="gpt-4o"))
 
             thread_id = os.getenv("THREAD_ID", "local-demo-thread")
-            bootstrapped = False
+            # A resumed thread already has its system prompt
+            bootstrapped = await memory.ahas_thread(thread_id)
+            if bootstrapped:
+                print(f"(resuming thread: {thread_id})")
             cb = PrintHandler()
 
             print("\nAgent ready. Type '/new' for a fresh thread, 'quit' to exit.")
@@ -106,17 +111,30 @@ async def main():
                     messages = [HumanMessage(content=q)]
 
                 config = {"configurable": {"thread_id": thread_id}, "callbacks": [cb]}
-                result = await agent.ainvoke({"messages": messages}, config=config)
-
-                final = result["messages"][-1].content
-                print("\n📝 FINAL ANSWER:\n" + str(final))
-
-                # Quick state snapshot
-                try:
-                    state = await agent.aget_state(config=config)
-                    msgs = state.values.get("messages", [])
-                except Exception:
-                    msgs = result.get("messages", [])
+                # Stream model tokens as they are generated; keep the last state for the summary below
+                result = {"messages": []}
+                streaming = False
+                async for mode, payload in agent.astream(
+                    {"messages": messages}, config=config, stream_mode=["messages", "values"]
+                ):
+                    if mode == "values":
+                        result = payload
+                        continue
+                    chunk, metadata = payload
+                    if metadata.get("langgraph_node") == "agent" and isinstance(chunk, AIMessageChunk) and chunk.content:
+                        if not streaming:
+                            print("\n📝 ANSWER (streaming):")
+                            streaming = True
+                        print(chunk.content, end="", flush=True)
+                if streaming:
+                    print()
+
+                final = result["messages"][-1].content if result["messages"] else ""
+                if not streaming:
+                    print("\n📝 FINAL ANSWER:\n" + str(final))
+
+                # Quick state snapshot from the final streamed state (no extra checkpoint read)
+                msgs = result.get("messages", [])
                 print("\n📦 STATE SNAPSHOT")
                 print(f"thread_id: {thread_id}")
                 print(f"total messages stored: {len(msgs)}")
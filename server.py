@@ -1,22 +1,134 @@
 # MCP_PROJECT/server.py
 
+import argparse
+import os
+import sys
 from dotenv import load_dotenv
+from utils import config
 from utils.initiate_mcp import mcp
-from tools.document_retrieval import document_retrieval_tool
+from utils.deferred import import_in_background
+# Registering the tools only declares their schemas; the RAG stack loads on first use or in start_warm_up()
+from tools.document_retrieval import document_retrieval_tool, preload_tokenizer
 from tools.web_search import web_search_tool
+from tools import server_metrics
 
 load_dotenv()
 
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+
+def create_app():
+    """
+    ASGI app factory for one streamable-HTTP worker process.
+
+    Each worker serves the corpus snapshot written by the parent process,
+    memory-mapping the local index instead of ingesting on its own.
+    """
+    from utils.retriever import retriever
+    retriever.load_snapshot(os.environ.get("MCP_SNAPSHOT_PATH", config.SNAPSHOT_PATH))
+    return mcp.streamable_http_app()
+
+
+def serve_workers(host: str, port: int, workers: int):
+    """
+    Ingest once, snapshot the corpus, then serve streamable HTTP from `workers` processes.
+
+    Raises:
+        RuntimeError: If ingestion fails; workers are never started on a partial index.
+    """
+    import uvicorn
+    from utils.retriever import retriever
+
+    retriever.warm_up()
+    retriever.save_snapshot(config.SNAPSHOT_PATH)
+    # Workers import this module afresh; tell them which snapshot to serve
+    os.environ["MCP_SNAPSHOT_PATH"] = config.SNAPSHOT_PATH
+    print(f"Running server with Streamable HTTP transport on {workers} workers")
+    uvicorn.run("server:create_app", factory=True, host=host, port=port, workers=workers,
+                log_level=mcp.settings.log_level.lower(), app_dir=config.PROJECT_ROOT)
+
+
+def start_warm_up():
+    """
+    Import the RAG stack and ingest the corpus in the background.
+
+    The transport starts right away, so `initialize` and `list_tools` are
+    answered while langchain, the vector store, the corpus and the tokenizer load.
+    """
+    def _ingest():
+        from utils.retriever import retriever
+        retriever.start_warm_up()
+        preload_tokenizer()
+
+    import_in_background(then=_ingest)
+
+
+def serve_stdio():
+    """
+    Serve over stdin/stdout with everything but the protocol kept off stdout.
+
+    The protocol writes to the process' real stdout; `sys.stdout` is pointed at
+    stderr before the warm-up starts, so nothing printed by the background
+    imports, ingestion or a third-party library can interleave with JSON-RPC
+    messages.
+    """
+    import anyio
+    from io import TextIOWrapper
+    from mcp.server.stdio import stdio_server
+
+    protocol_out = anyio.wrap_file(TextIOWrapper(sys.stdout.buffer, encoding="utf-8"))
+    sys.stdout = sys.stderr
+    start_warm_up()
+    print("Running server with stdio transport")
+
+    async def _serve():
+        async with stdio_server(stdout=protocol_out) as (read_stream, write_stream):
+            await mcp._mcp_server.run(read_stream, write_stream, mcp._mcp_server.create_initialization_options())
+
+    anyio.run(_serve)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Agentic RAG MCP server")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=config.MCP_TRANSPORT,
+                        help="Defaults to $MCP_TRANSPORT (sse)")
+    parser.add_argument("--host", default=config.MCP_HOST, help="Defaults to $MCP_HOST")
+    parser.add_argument("--port", type=int, default=config.MCP_PORT, help="Defaults to $MCP_PORT")
+    parser.add_argument("--workers", type=int, default=config.MCP_WORKERS,
+                        help="Worker processes; streamable-http only. Defaults to $MCP_WORKERS (1)")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="Drop the vector index, re-embed the whole corpus and exit")
+    args = parser.parse_args(argv)
+    if args.workers > 1 and args.transport != "streamable-http":
+        parser.error("--workers > 1 needs --transport streamable-http (SSE and stdio sessions live in one process)")
+    return args
+
+
 if __name__ == "__main__":
-    transport = "sse"
+    args = parse_args()
+    transport = args.transport
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+
+    if args.rebuild_index:
+        from utils.retriever import retriever
+        print(f"Rebuilt the index with {retriever.reindex(force=True)} chunks.")
+        sys.exit(0)
+    if transport == "streamable-http" and args.workers > 1:
+        serve_workers(args.host, args.port, args.workers)
+        sys.exit(0)
     if transport == "stdio":
-        print("Running server with stdio transport")
-        mcp.run(transport="stdio")
-    elif transport == "sse":
+        serve_stdio()
+        sys.exit(0)
+
+    # Ingest the corpus once in the background instead of on every query
+    start_warm_up()
+
+    if transport == "sse":
         print("Running server with SSE transport")
         mcp.run(transport="sse")
     elif transport == "streamable-http":
         print("Running server with Streamable HTTP transport")
         mcp.run(transport="streamable-http")
     else:
-        raise ValueError(f"Unknown transport: {transport}")
\ No newline at end of file
+        raise ValueError(f"Unknown transport: {transport}")
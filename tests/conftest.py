@@ -0,0 +1,8 @@
+# MCP_PROJECT/tests/conftest.py
+
+import tempfile
+from benchmarks.fakes import configure_environment
+
+# utils.config reads the environment on import: point every cache at a scratch
+# directory and select the offline backends before any test module imports it
+configure_environment(tempfile.mkdtemp(prefix="mcp-tests-"), RETRY_BACKOFF_SECONDS="0")
@@ -0,0 +1,67 @@
+# MCP_PROJECT/tests/test_chunking.py
+
+from langchain_core.documents import Document
+from utils.document_utils import chunk_text
+
+
+def make_pages(*texts, source="docs/a.pdf"):
+    return [Document(page_content=text, metadata={"source": source, "page": page})
+            for page, text in enumerate(texts)]
+
+
+def labelled(chunks):
+    return [(chunk["text"], chunk["metadata"]["page"]) for chunk in chunks]
+
+
+def test_duplicate_text_is_attributed_to_its_own_page():
+    footer = "Shared boilerplate footer text.\n\n"
+    pages = make_pages(footer + "Alpha paragraph on page one.\n\n", footer + "Beta paragraph on page two.\n\n", footer)
+
+    chunks = chunk_text(pages, 40, 0)
+
+    assert labelled(chunks) == [
+        ("Shared boilerplate footer text.", "1"),
+        ("Alpha paragraph on page one.", "1"),
+        ("Shared boilerplate footer text.", "2"),
+        ("Beta paragraph on page two.", "2"),
+        ("Shared boilerplate footer text.", "3"),
+    ]
+
+
+def test_chunk_crossing_a_page_boundary_lists_both_pages():
+    pages = make_pages("one two three four five six seven eight ", "nine ten eleven twelve thirteen fourteen")
+
+    chunks = chunk_text(pages, 30, 10)
+
+    assert labelled(chunks) == [
+        ("one two three four five six", "1"),
+        ("five six seven eight nine ten", "1,2"),
+        ("nine ten eleven twelve", "2"),
+        ("twelve thirteen fourteen", "2"),
+    ]
+
+
+def test_overlapping_chunks_of_repeated_text_advance_through_the_pages():
+    # Every chunk is the same string, so only the tracked offsets tell the pages apart
+    chunks = chunk_text(make_pages("word " * 20, "word " * 20), 30, 10)
+
+    assert [chunk["metadata"]["page"] for chunk in chunks] == ["1"] * 4 + ["1,2"] + ["2"] * 5
+
+
+def test_chunks_never_span_source_files():
+    pages = make_pages("first file ends here", source="docs/a.pdf") + make_pages("second file", source="docs/b.pdf")
+
+    chunks = chunk_text(pages, 100, 0)
+
+    assert [(chunk["text"], chunk["metadata"]) for chunk in chunks] == [
+        ("first file ends here", {"source": "docs/a.pdf", "page": "1"}),
+        ("second file", {"source": "docs/b.pdf", "page": "1"}),
+    ]
+
+
+def test_page_labels_take_precedence_over_page_numbers():
+    pages = make_pages("Preface text.\n\n", "Body text.\n\n")
+    pages[0].metadata["page_label"] = "iv"
+    pages[1].metadata["page_label"] = "1"
+
+    assert labelled(chunk_text(pages, 20, 0)) == [("Preface text.", "iv"), ("Body text.", "1")]
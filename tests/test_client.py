@@ -0,0 +1,72 @@
+# MCP_PROJECT/tests/test_client.py
+
+import asyncio
+import pytest
+
+pytest.importorskip("nest_asyncio")
+import client  # noqa: E402
+
+
+def tool_call_message(step):
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{"id": f"call-{step}", "type": "function",
+                        "function": {"name": "lookup", "arguments": "{}"}}],
+    }
+
+
+class ScriptedClient(client.MCPOpenAIClient):
+    """Replays canned (message, finish_reason) replies instead of calling OpenAI or MCP."""
+
+    def __init__(self, replies):
+        super().__init__()
+        self.replies = list(replies)
+        self.tool_calls = 0
+
+    async def call_openai(self):
+        return self.replies.pop(0)
+
+    async def call_tool(self, tool_call, show_name=False):
+        self.tool_calls += 1
+        return {"role": "tool", "tool_call_id": tool_call["id"], "content": "result"}
+
+
+@pytest.fixture
+def tool_steps(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(client, "MAX_TOOL_STEPS", 2)
+    return 2
+
+
+def run(replies, first):
+    scripted = ScriptedClient(replies)
+    answer = asyncio.run(scripted.process_openai_response(*first))
+    return scripted, answer
+
+
+def test_answer_without_tools_is_returned(tool_steps):
+    scripted, answer = run([], ({"role": "assistant", "content": "hello"}, "stop"))
+
+    assert answer == "hello"
+    assert scripted.tool_calls == 0
+    assert scripted.memory.window()[-1] == {"role": "assistant", "content": "hello"}
+
+
+def test_answer_after_the_last_tool_round_is_kept(tool_steps):
+    replies = [(tool_call_message(1), "tool_calls"), ({"role": "assistant", "content": "final"}, "stop")]
+
+    scripted, answer = run(replies, (tool_call_message(0), "tool_calls"))
+
+    assert answer == "final"
+    assert scripted.tool_calls == tool_steps
+    assert scripted.memory.window()[-1] == {"role": "assistant", "content": "final"}
+
+
+def test_gives_up_when_the_model_keeps_calling_tools(tool_steps):
+    replies = [(tool_call_message(1), "tool_calls"), (tool_call_message(2), "tool_calls")]
+
+    scripted, answer = run(replies, (tool_call_message(0), "tool_calls"))
+
+    assert answer.startswith(f"Stopped after {tool_steps} tool-calling steps")
+    assert scripted.tool_calls == tool_steps
@@ -0,0 +1,148 @@
+# MCP_PROJECT/tests/test_ingestion.py
+
+import json
+import pytest
+from benchmarks.fakes import FakeEmbeddings, FakePineconeIndex
+from vector_store.ingestion import chunk_id, embed_and_upsert, load_manifest, sync_vector_store
+from vector_store.pinecone_db import PineconeVectorStore
+
+
+def make_chunks(*texts, source="docs/a.pdf"):
+    return [{"text": text, "metadata": {"source": source, "page": str(page)}}
+            for page, text in enumerate(texts, start=1)]
+
+
+@pytest.fixture
+def embeddings():
+    return FakeEmbeddings(dimension=8)
+
+
+@pytest.fixture
+def store():
+    return PineconeVectorStore(FakePineconeIndex())
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return str(tmp_path / "manifest.json")
+
+
+def sync(chunks, store, embeddings, manifest_path, **kwargs):
+    return sync_vector_store(chunks, store, embedding_model=embeddings, manifest_path=manifest_path, **kwargs)
+
+
+def test_first_sync_adds_every_chunk(store, embeddings, manifest_path):
+    chunks = make_chunks("alpha", "beta", "gamma")
+
+    stats = sync(chunks, store, embeddings, manifest_path)
+
+    assert stats == {"added": 3, "deleted": 0, "unchanged": 0}
+    assert store.count() == 3
+    assert embeddings.texts == 3
+    assert set(load_manifest(manifest_path)) == {chunk_id(c) for c in chunks}
+
+
+def test_unchanged_chunks_are_not_embedded_again(store, embeddings, manifest_path):
+    chunks = make_chunks("alpha", "beta")
+    sync(chunks, store, embeddings, manifest_path)
+    embedded = embeddings.texts
+
+    stats = sync(chunks, store, embeddings, manifest_path)
+
+    assert stats == {"added": 0, "deleted": 0, "unchanged": 2}
+    assert embeddings.texts == embedded
+    assert store.count() == 2
+
+
+def test_changed_chunks_are_added_and_stale_ones_deleted(store, embeddings, manifest_path):
+    sync(make_chunks("alpha", "beta", "gamma"), store, embeddings, manifest_path)
+    embedded = embeddings.texts
+    updated = make_chunks("alpha", "beta (edited)", "gamma")
+
+    stats = sync(updated, store, embeddings, manifest_path)
+
+    assert stats == {"added": 1, "deleted": 1, "unchanged": 2}
+    assert embeddings.texts == embedded + 1
+    assert store.count() == 3
+    assert set(load_manifest(manifest_path)) == {chunk_id(c) for c in updated}
+
+
+def test_duplicate_chunks_are_indexed_once(store, embeddings, manifest_path):
+    chunks = make_chunks("alpha") * 2
+
+    stats = sync(chunks, store, embeddings, manifest_path)
+
+    assert stats["added"] == 1
+    assert store.count() == 1
+
+
+def test_manifest_from_another_embedding_model_rebuilds_the_store(store, embeddings, manifest_path):
+    chunks = make_chunks("alpha", "beta")
+    sync(chunks, store, embeddings, manifest_path)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["embedding_model"] = "some-other-model"
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    stats = sync(chunks, store, embeddings, manifest_path)
+
+    assert stats == {"added": 2, "deleted": 0, "unchanged": 0}
+    assert store.count() == 2
+    assert load_manifest(manifest_path) is not None
+
+
+def test_manifest_without_vectors_reindexes_everything(store, embeddings, manifest_path):
+    chunks = make_chunks("alpha", "beta")
+    sync(chunks, store, embeddings, manifest_path)
+    store.delete_all()
+
+    stats = sync(chunks, store, embeddings, manifest_path)
+
+    assert stats["added"] == 2
+    assert store.count() == 2
+
+
+def test_missing_manifest_clears_vectors_it_cannot_account_for(store, embeddings, manifest_path):
+    store.upsert([("legacy-0", [1.0] * 8, {})])
+
+    stats = sync(make_chunks("alpha"), store, embeddings, manifest_path)
+
+    assert stats["added"] == 1
+    assert store.count() == 1
+    assert store.query([1.0] * 8, top_k=5)[0].id != "legacy-0"
+
+
+def test_force_re_embeds_everything(store, embeddings, manifest_path):
+    chunks = make_chunks("alpha", "beta")
+    sync(chunks, store, embeddings, manifest_path)
+
+    stats = sync(chunks, store, embeddings, manifest_path, force=True)
+
+    assert stats["added"] == 2
+    assert embeddings.texts == 4
+    assert store.count() == 2
+
+
+def test_embed_and_upsert_batches_and_retries_failed_upserts(store, embeddings):
+    items = [(f"id-{i}", f"text {i}", {"i": i}) for i in range(25)]
+    failures = []
+    upsert = store.upsert
+
+    def flaky_upsert(vectors):
+        if not failures:
+            failures.append(len(vectors))
+            raise ConnectionError("transient")
+        upsert(vectors)
+
+    store.upsert = flaky_upsert
+    progress = []
+
+    stats = embed_and_upsert(items, store, embedding_model=embeddings, batch_size=4, max_workers=3,
+                             upsert_batch_size=10, progress_callback=lambda done, total, _: progress.append(done))
+
+    assert stats["chunks"] == 25
+    assert embeddings.calls == 7
+    assert failures == [10]
+    assert store.count() == 25
+    assert progress == [10, 20, 25]
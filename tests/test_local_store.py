@@ -0,0 +1,113 @@
+# MCP_PROJECT/tests/test_local_store.py
+
+import threading
+import numpy as np
+import pytest
+from vector_store.local_db import LocalVectorStore
+
+DIMENSION = 8
+
+
+def vector_for(n):
+    return np.random.default_rng(n).standard_normal(DIMENSION).tolist()
+
+
+def records(numbers):
+    return [(f"id-{n}", vector_for(n), {"n": n}) for n in numbers]
+
+
+def test_query_while_upsert_grows_the_buffer(tmp_path, monkeypatch):
+    monkeypatch.setattr(LocalVectorStore, "MIN_CAPACITY", 4)
+    store = LocalVectorStore(str(tmp_path / "index"))
+    store.upsert(records(range(4)))
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        try:
+            for start in range(4, 4000, 4):
+                store.upsert(records(range(start, start + 4)))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    probe = vector_for(0)
+    while not done.is_set():
+        matches = store.query(probe, top_k=10_000)
+        assert matches[0].id == "id-0"
+        for match in matches:
+            assert match.id == f"id-{match.metadata['n']}"
+    thread.join()
+
+    assert not errors
+    assert store.count() == 4000
+
+
+def unit(n):
+    vector = np.asarray(vector_for(n))
+    return vector / np.linalg.norm(vector)
+
+
+def assert_aligned(store, expected):
+    """Every stored id comes back with its own metadata and the cosine score of its own vector."""
+    assert store.count() == len(expected)
+    for vector_id, n in expected.items():
+        matches = store.query(vector_for(n), top_k=len(expected))
+        assert matches[0].id == vector_id
+        assert {match.id for match in matches} == set(expected)
+        for match in matches:
+            assert match.metadata == {"n": expected[match.id]}
+            assert match.score == pytest.approx(float(unit(n) @ unit(expected[match.id])), abs=0.02)
+
+
+@pytest.fixture(params=["none", "float16", "int8"])
+def store(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(LocalVectorStore, "MIN_CAPACITY", 4)
+    return LocalVectorStore(str(tmp_path / "index"), quantization=request.param)
+
+
+def test_growth_across_capacity_doublings(store):
+    expected = {}
+    for start in range(0, 40, 3):
+        store.upsert(records(range(start, start + 3)))
+        expected.update({f"id-{n}": n for n in range(start, start + 3)})
+
+    assert len(store._buffer) == 64
+    assert_aligned(store, expected)
+
+
+def test_overwriting_published_ids(store):
+    store.upsert(records(range(10)))
+    published, row = store._vectors, np.array(store._vectors[3])
+
+    # Overwrites and additions in one batch, with a repeated id where the last one wins
+    store.upsert([("id-3", vector_for(103), {"n": 103}), ("id-7", vector_for(104), {"n": 999}),
+                  ("id-7", vector_for(107), {"n": 107})] + records(range(10, 12)))
+
+    expected = {f"id-{n}": n for n in range(12)}
+    expected.update({"id-3": 103, "id-7": 107})
+    assert_aligned(store, expected)
+    # Rows a running query may still hold are copied, not rewritten
+    assert np.array_equal(published[3], row)
+
+
+def test_deleting_rows(store):
+    store.upsert(records(range(12)))
+
+    store.delete(["id-0", "id-5", "id-11", "missing"])
+    store.upsert(records(range(12, 14)))
+
+    assert_aligned(store, {f"id-{n}": n for n in range(1, 14) if n not in (5, 11)})
+
+
+def test_save_and_load_keep_rows_aligned(store):
+    store.upsert(records(range(6)))
+    store.delete(["id-2"])
+    store.save()
+
+    loaded = LocalVectorStore(store.path, quantization=store.quantization)
+
+    assert_aligned(loaded, {f"id-{n}": n for n in range(6) if n != 2})
@@ -0,0 +1,39 @@
+# MCP_PROJECT/tests/test_reranker.py
+
+import sys
+import threading
+import time
+import types
+from utils.reranker import CrossEncoderReranker
+
+
+class SlowCrossEncoder:
+    """Counts model loads; scores a pair by how often the query's words occur in the text."""
+    loads = 0
+
+    def __init__(self, model_name):
+        SlowCrossEncoder.loads += 1
+        time.sleep(0.05)
+
+    def predict(self, pairs, batch_size=32):
+        return [sum(text.count(word) for word in query.split()) for query, text in pairs]
+
+
+def test_concurrent_first_requests_load_the_model_once(monkeypatch):
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(CrossEncoder=SlowCrossEncoder))
+    monkeypatch.setattr(SlowCrossEncoder, "loads", 0)
+    reranker = CrossEncoderReranker("test-model")
+    candidates = [("agents", {"page": "1"}), ("agents agents", {"page": "2"}), ("retrieval", {"page": "3"})]
+    results = []
+
+    def rerank():
+        results.append(reranker.rerank("agents", candidates, top_k=2))
+
+    threads = [threading.Thread(target=rerank) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SlowCrossEncoder.loads == 1
+    assert results == [[("agents agents", {"page": "2", "score": 2.0}), ("agents", {"page": "1", "score": 1.0})]] * 8
@@ -0,0 +1,67 @@
+# MCP_PROJECT/tests/test_retriever.py
+
+import pytest
+import utils.retriever
+import vector_store.ingestion
+from benchmarks.fakes import FakeEmbeddings
+from utils import config
+from utils.retriever import DocumentRetriever
+
+
+def make_chunks(*texts):
+    return [{"text": text, "metadata": {"source": "docs/a.pdf", "page": str(page)}}
+            for page, text in enumerate(texts, start=1)]
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    """The chunk list the next ingestion reads, in place of the PDFs."""
+    chunks = []
+    embeddings = FakeEmbeddings(dimension=8)
+    monkeypatch.setattr(config, "VECTOR_STORE_BACKEND", "local")
+    monkeypatch.setattr(config, "LOCAL_INDEX_PATH", str(tmp_path / "index"))
+    monkeypatch.setattr(config, "INDEX_MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(config, "RETRIEVAL_MODE", "hybrid")
+    monkeypatch.setattr(config, "RERANKER_ENABLED", False)
+    monkeypatch.setattr(vector_store.ingestion, "embeddings", embeddings)
+    monkeypatch.setattr(utils.retriever, "embeddings", embeddings)
+    monkeypatch.setattr(utils.retriever, "iter_pdf_pages", lambda documents_dir: [])
+    monkeypatch.setattr(utils.retriever, "chunk_text", lambda pages, size, overlap: list(chunks))
+    return chunks
+
+
+def test_reindex_leaves_the_served_store_untouched(corpus):
+    corpus[:] = make_chunks("alpha agents", "beta retrieval")
+    retriever = DocumentRetriever()
+    retriever.warm_up()
+    served, version = retriever.store, retriever.corpus_version
+
+    corpus[:] = make_chunks("gamma generation")
+    assert retriever.reindex() == 1
+
+    assert served.count() == 2
+    assert retriever.store is not served
+    assert retriever.store.count() == 1
+    assert retriever.corpus_version != version
+    assert [text for text, _ in retriever.query("gamma", top_k=5)] == ["gamma generation"]
+
+
+def test_a_search_ranks_against_the_corpus_it_started_with(corpus):
+    corpus[:] = make_chunks("alpha agents", "beta retrieval")
+    retriever = DocumentRetriever()
+    retriever.warm_up()
+    served = retriever.store
+    search = served.query
+
+    def query_then_reindex(vector, top_k):
+        # The corpus is replaced while this search is in flight
+        matches = search(vector, top_k)
+        corpus[:] = make_chunks("gamma generation", "delta agents")
+        retriever.reindex()
+        return matches
+
+    served.query = query_then_reindex
+    texts = [text for text, _ in retriever.query("agents", top_k=5)]
+
+    assert sorted(texts) == ["alpha agents", "beta retrieval"]
+    assert [text for text, _ in retriever.query("agents", top_k=1)] == ["delta agents"]
@@ -1,14 +1,87 @@
 # MCP_PROJECT/tools/document_retrieval.py
 
-import os
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from mcp.server.fastmcp import Context
 from utils.initiate_mcp import mcp
-from utils.document_utils import load_pdf
-from utils.embeddings import embeddings
-from vector_store.pinecone_db import create_pinecone_index, upsert_data_to_pinecone
-from utils.openai_call import summarize_with_llm  # ✅ new import
+from utils.concurrency import limiters
+from utils.conversation_memory import TokenCounter
+from utils.deferred import aimport
+from utils.metrics import metrics
+from utils import config
+
+# Pipeline stages reported as MCP progress; answer tokens stream after the last one
+RETRIEVAL_STAGES = 4
+# Streamed answer text is flushed to the client at most this often (seconds) ...
+STREAM_FLUSH_INTERVAL = 0.1
+# ... or once this many characters are buffered
+STREAM_FLUSH_CHARS = 64
+
+# Tokenizer for the retrieval-only budget; loaded by preload_tokenizer() or on first use
+_counter = TokenCounter(config.LLM_MODEL)
+
+
+@dataclass
+class RetrievedChunk:
+    """One ranked passage returned by retrieve_chunks_tool."""
+    text: str
+    source: str
+    page: str
+    score: float
+
+
+@dataclass
+class RetrievalResult:
+    """Structured result of retrieve_chunks_tool."""
+    query: str
+    chunks: list[RetrievedChunk]
+    tokens: int
+    truncated: bool
+
+
+def preload_tokenizer():
+    """Load the retrieval-budget tokenizer (a possible download) ahead of the first tool call."""
+    _counter.preload()
+
+
+async def _report(ctx, progress, message):
+    """Send an MCP progress notification if the caller asked for progress."""
+    if ctx is not None:
+        await ctx.report_progress(progress, total=RETRIEVAL_STAGES + 1, message=message)
+
+
+async def _stream_answer(ctx, tokens):
+    """
+    Collect a streamed LLM answer, forwarding the text to the client as it is produced.
+
+    Tokens are batched into progress notifications so the client can render
+    the answer incrementally; the full text is still returned as the tool result.
+    """
+    parts = []
+    buffer = ""
+    flushes = 0
+    last_flush = time.perf_counter()
+    async with limiters["llm"].slot():
+        async for token in tokens:
+            parts.append(token)
+            buffer += token
+            now = time.perf_counter()
+            if len(buffer) >= STREAM_FLUSH_CHARS or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                # Progress must keep increasing: approach the final stage without reaching it
+                flushes += 1
+                await _report(ctx, RETRIEVAL_STAGES + flushes / (flushes + 1), buffer)
+                buffer, last_flush = "", now
+    if buffer:
+        flushes += 1
+        await _report(ctx, RETRIEVAL_STAGES + flushes / (flushes + 1), buffer)
+    return "".join(parts)
+
 
 @mcp.tool()
-def document_retrieval_tool(query: str) -> str:
+@metrics.timed("tool.document_retrieval")
+async def document_retrieval_tool(query: str, top_k: int = config.TOP_K, ctx: Context = None) -> str:
     """
     Retrieve information from embedded documents based on the query and return a summarized answer.
 
@@ -29,25 +102,197 @@ def document_retrieval_tool(query: str) -> str:
     Usage Guidance:
         Use this tool to answer questions that can be answered using these documents.
         If no relevant content is found, consider using a web search or fallback tool.
+        Raise top_k for broad questions that need more passages.
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    documents_dir = os.path.abspath(os.path.join(current_dir, "..", "documents"))
-    documents, full_text = load_pdf(documents_dir)
+    top_k = max(1, min(top_k, config.MAX_TOP_K))
+    # Cached answers were produced from the default number of chunks
+    use_cache = config.ANSWER_CACHE_ENABLED and top_k == config.TOP_K
+    retriever = (await aimport("utils.retriever")).retriever
+    answer_cache = (await aimport("utils.answer_cache")).answer_cache
+    if not retriever.is_ready:
+        await _report(ctx, 0, "Waiting for document ingestion...\n")
+        with metrics.timer("retrieval.wait_for_ingest"):
+            await asyncio.to_thread(retriever.ensure_ready)
+    version = retriever.corpus_version
+
+    if use_cache:
+        cached = answer_cache.get_exact(query, version)
+        if cached is not None:
+            return cached
 
-    try:
-        index = create_pinecone_index()
-        upsert_data_to_pinecone(documents, full_text, index)
-    except Exception as e:
-        raise RuntimeError(f"Error preparing documents: {e}")
+    await _report(ctx, 1, "Embedding query...\n")
+    with metrics.timer("retrieval.embed"):
+        query_embedding = await retriever.aembed_query(query)
+    if use_cache:
+        cached = answer_cache.get(query, version, embedding=query_embedding)
+        if cached is not None:
+            return cached
 
-    query_embedding = embeddings.embed_query(query)
-    response = index.query(vector=query_embedding, top_k=3, include_metadata=True)
-    matched_chunks = [(match.metadata["text"], match.metadata) for match in response.matches]
+    await _report(ctx, 2, "Searching documents...\n")
+    with metrics.timer("retrieval.search"):
+        matched_chunks = await retriever.asearch(query_embedding, top_k, query=query)
 
     if not matched_chunks:
         return "No relevant information found in the provided documents."
 
+    await _report(ctx, 3, f"Summarizing {len(matched_chunks)} matching chunks...\n")
     context_text = "\n\n".join([chunk for chunk, _ in matched_chunks])
-    summary = summarize_with_llm(question=query, context=context_text)
+    with metrics.timer("retrieval.generate"):
+        openai_call = await aimport("utils.openai_call")
+        summary = await _stream_answer(ctx, openai_call.astream_summary(query, context_text))
+    await _report(ctx, RETRIEVAL_STAGES + 1, "\n")
 
+    if use_cache:
+        answer_cache.put(query, version, summary, embedding=query_embedding)
     return summary
+
+
+@mcp.tool()
+@metrics.timed("tool.batch_document_retrieval")
+async def batch_document_retrieval_tool(queries: list[str], mode: str = "per_query", top_k: int = config.TOP_K,
+                                        ctx: Context = None) -> str:
+    """
+    Answer several related questions from the embedded documents in one call.
+
+    Prefer this over repeated document_retrieval_tool calls when a question has
+    been broken into sub-queries: all queries are embedded and searched together
+    and answered by a single summarization.
+
+    Args:
+        queries: The sub-queries to answer (up to 10).
+        mode: "per_query" for a separate answer to each query, or "combined" for one answer covering all of them.
+        top_k: Number of passages to retrieve per query.
+    """
+    queries = [q for q in dict.fromkeys(q.strip() for q in queries) if q]
+    if not queries:
+        return "No queries given."
+    if len(queries) > config.MAX_BATCH_QUERIES:
+        return f"Too many queries: at most {config.MAX_BATCH_QUERIES} per call."
+    if mode not in ("per_query", "combined"):
+        return 'Unknown mode: use "per_query" or "combined".'
+    top_k = max(1, min(top_k, config.MAX_TOP_K))
+
+    retriever = (await aimport("utils.retriever")).retriever
+    if not retriever.is_ready:
+        await _report(ctx, 0, "Waiting for document ingestion...\n")
+        await asyncio.to_thread(retriever.ensure_ready)
+
+    await _report(ctx, 1, f"Searching documents for {len(queries)} queries...\n")
+    with metrics.timer("retrieval.batch_search"):
+        results = await retriever.aquery_many(queries, top_k)
+
+    # Passages found by several queries are sent to the LLM once
+    passages = {}
+    passages_per_query = []
+    for matched_chunks in results:
+        numbers = []
+        for text, _ in matched_chunks:
+            number = passages.setdefault(text, len(passages) + 1)
+            if number not in numbers:
+                numbers.append(number)
+        passages_per_query.append(numbers)
+
+    if not passages:
+        return "No relevant information found in the provided documents."
+
+    await _report(ctx, 3, f"Summarizing {len(passages)} distinct passages for {len(queries)} queries...\n")
+    questions_text = "\n".join(
+        f"{i}. {query}" + (f" (passages {', '.join(map(str, numbers))})" if mode == "per_query" and numbers else "")
+        for i, (query, numbers) in enumerate(zip(queries, passages_per_query), start=1)
+    )
+    context_text = "\n\n".join(f"[{number}] {text}" for text, number in passages.items())
+    with metrics.timer("retrieval.batch_generate"):
+        openai_call = await aimport("utils.openai_call")
+        answer = await _stream_answer(ctx, openai_call.astream_batch_summary(questions_text, context_text, mode))
+    await _report(ctx, RETRIEVAL_STAGES + 1, "\n")
+    return answer
+
+
+def _pack_chunks(matched_chunks, max_tokens, max_chars):
+    """
+    Keep ranked chunks, best first, until the token or character budget is spent.
+
+    The chunk that crosses the budget is cut to fit, so the result is never
+    empty while anything matched. A budget of 0 means no limit.
+
+    Returns:
+        tuple: (list of RetrievedChunk, tokens used, whether anything was cut or dropped)
+    """
+    packed = []
+    tokens = chars = 0
+    truncated = False
+    for text, metadata in matched_chunks:
+        text_tokens = _counter.count_text(text)
+        room = len(text)
+        if max_tokens and tokens + text_tokens > max_tokens:
+            # Roughly 4 characters per token
+            room = min(room, (max_tokens - tokens) * 4)
+        if max_chars and chars + room > max_chars:
+            room = min(room, max_chars - chars)
+        if room < len(text):
+            truncated = True
+            # Only cut a passage when enough of it survives to be useful
+            if room <= 0 or (packed and room < 200):
+                break
+            text = text[:max(room - 4, 1)].rstrip() + " ..."
+            text_tokens = _counter.count_text(text)
+
+        packed.append(RetrievedChunk(text=text, source=metadata.get("source", ""), page=metadata.get("page", ""),
+                                     score=float(metadata.get("score", 0.0))))
+        tokens += text_tokens
+        chars += len(text)
+        if truncated:
+            break
+    return packed, tokens, truncated
+
+
+@mcp.tool()
+@metrics.timed("tool.retrieve_chunks")
+async def retrieve_chunks_tool(query: str, top_k: int = config.TOP_K, max_tokens: int = config.RETRIEVAL_TOKEN_BUDGET,
+                               max_chars: int = 0) -> RetrievalResult:
+    """
+    Return the most relevant passages from the embedded documents without summarizing them.
+
+    Faster than document_retrieval_tool because no LLM is involved: use it when
+    you will reason over the passages yourself. Each passage has its text,
+    source file, page and relevance score, best first.
+
+    Args:
+        query: What to look for in the documents.
+        top_k: Number of passages to retrieve.
+        max_tokens: Token budget for the returned passages (0 for no limit).
+        max_chars: Character budget for the returned passages (0 for no limit).
+    """
+    top_k = max(1, min(top_k, config.MAX_TOP_K))
+    retriever = (await aimport("utils.retriever")).retriever
+    matched_chunks = await retriever.aquery(query, top_k)
+    # Token counting is CPU-bound and may load the tokenizer; keep it off the event loop
+    chunks, tokens, truncated = await asyncio.to_thread(_pack_chunks, matched_chunks, max(0, max_tokens),
+                                                        max(0, max_chars))
+    return RetrievalResult(query=query, chunks=chunks, tokens=tokens, truncated=truncated)
+
+
+@mcp.tool()
+@metrics.timed("tool.reindex_documents")
+async def reindex_documents_tool() -> str:
+    """
+    Re-ingest the documents folder into the vector index.
+
+    Use this after PDFs have been added, removed or edited so that
+    document_retrieval_tool answers from the current corpus. Only new or
+    changed chunks are embedded.
+    """
+    # Full rebuilds drop the index and re-embed everything; they are left to `server.py --rebuild-index`
+    retriever = (await aimport("utils.retriever")).retriever
+    chunk_count = await asyncio.to_thread(retriever.reindex)
+    sync = retriever.last_sync
+    return (f"Re-indexed {chunk_count} chunks from {retriever.documents_dir} "
+            f"({sync.get('added', 0)} added, {sync.get('deleted', 0)} deleted, "
+            f"{sync.get('unchanged', 0)} unchanged).")
+
+
+@mcp.resource("cache://answers/stats", mime_type="application/json")
+def answer_cache_stats() -> str:
+    """Hit/miss counters of the document_retrieval_tool answer cache."""
+    from utils.answer_cache import answer_cache
+    return json.dumps(answer_cache.stats())
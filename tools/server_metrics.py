@@ -0,0 +1,25 @@
+# MCP_PROJECT/tools/server_metrics.py
+
+import json
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from utils.initiate_mcp import mcp
+from utils.metrics import metrics
+
+
+@mcp.resource("metrics://server", mime_type="application/json")
+def server_metrics() -> str:
+    """Latency percentiles per pipeline stage, counters and cache statistics of this server."""
+    return json.dumps(metrics.snapshot())
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request):
+    """
+    Prometheus scrape endpoint for the HTTP transports (SSE / streamable HTTP).
+
+    `/metrics?format=json` returns the same snapshot as the MCP resource.
+    """
+    if request.query_params.get("format") == "json":
+        return JSONResponse(metrics.snapshot())
+    return PlainTextResponse(metrics.prometheus(), media_type="text/plain; version=0.0.4")
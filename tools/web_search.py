@@ -1,12 +1,14 @@
 # MCP_PROJECT/tools/web_search.py
 
-from langchain.agents import tool
-from langchain_community.tools import DuckDuckGoSearchRun
 from utils.initiate_mcp import mcp
+from utils.deferred import aimport
+from utils.metrics import metrics
 
 @mcp.tool()
-def web_search_tool(query: str) -> str:
+@metrics.timed("tool.web_search")
+async def web_search_tool(query: str) -> str:
     """
     Perform a web search using DuckDuckGo and return relevant info.
     """
-    return DuckDuckGoSearchRun().run(query)
\ No newline at end of file
+    search_client = await aimport("utils.search_client")
+    return await search_client.get_search_client().search(query)
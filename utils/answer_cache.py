@@ -0,0 +1,148 @@
+# MCP_PROJECT/utils/answer_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from utils import config
+from utils.metrics import metrics
+from utils.text import normalize_query
+
+
+class AnswerCache:
+    """
+    LRU + TTL cache of final answers keyed by query.
+
+    A lookup first tries the normalized query text, then (given the query
+    embedding) the most similar cached query at or above
+    `similarity_threshold`. Every entry is tagged with the corpus version it
+    was answered from; when the version changes the whole cache is dropped.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, similarity_threshold: float = 0.95):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._entries = OrderedDict()  # normalized query -> (answer, unit embedding | None, created_at)
+        self._matrix = None
+        self._matrix_keys = []
+        self._version = None
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _check_version(self, version):
+        if version != self._version:
+            self._entries.clear()
+            self._matrix = None
+            self._version = version
+
+    def _expired(self, created_at):
+        return time.time() - created_at > self.ttl_seconds
+
+    def _embedding_matrix(self):
+        """Stack cached query embeddings once per mutation for vectorised similarity."""
+        if self._matrix is None:
+            keys = [key for key, (_, vector, _) in self._entries.items() if vector is not None]
+            self._matrix_keys = keys
+            self._matrix = np.stack([self._entries[key][1] for key in keys]) if keys else None
+        return self._matrix
+
+    def get_exact(self, query: str, version):
+        """
+        Exact-match lookup only, so callers can skip embedding the query on a hit.
+
+        A miss here is not counted; follow up with `get` once the embedding is known.
+        """
+        key = normalize_query(query)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[2]):
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[0]
+        return None
+
+    def get(self, query: str, version, embedding=None):
+        """
+        Look up a cached answer.
+
+        Args:
+            query (str): The raw user query.
+            version (str): Current corpus version.
+            embedding (list[float]): Query embedding; enables the semantic match.
+
+        Returns:
+            str | None: The cached answer, or None on a miss.
+        """
+        key = normalize_query(query)
+        with self._lock:
+            self._check_version(version)
+
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[2]):
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[0]
+
+            if embedding is not None:
+                matrix = self._embedding_matrix()
+                if matrix is not None:
+                    vector = np.asarray(embedding, dtype=np.float32)
+                    vector /= np.linalg.norm(vector) or 1.0
+                    scores = matrix @ vector
+                    for row in np.argsort(-scores):
+                        if scores[row] < self.similarity_threshold:
+                            break
+                        match = self._matrix_keys[row]
+                        answer, _, created_at = self._entries[match]
+                        if not self._expired(created_at):
+                            self._entries.move_to_end(match)
+                            self.semantic_hits += 1
+                            return answer
+
+            self.misses += 1
+            return None
+
+    def put(self, query: str, version, answer: str, embedding=None):
+        """Store an answer for the query (and its embedding, if known)."""
+        key = normalize_query(query)
+        vector = None
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            vector /= np.linalg.norm(vector) or 1.0
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (answer, vector, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def stats(self) -> dict:
+        """Hit/miss counters; tune `similarity_threshold` against `semantic_hits`."""
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "similarity_threshold": self.similarity_threshold,
+            "corpus_version": self._version,
+        }
+
+
+answer_cache = AnswerCache(
+    max_entries=config.ANSWER_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.ANSWER_CACHE_TTL_SECONDS,
+    similarity_threshold=config.ANSWER_CACHE_SIMILARITY,
+)
+metrics.register_source("answer_cache", answer_cache.stats)
@@ -0,0 +1,209 @@
+# MCP_PROJECT/utils/checkpointer.py
+
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from utils import config
+
+MESSAGES_CHANNEL = "messages"
+# Stands in for the message list inside a stored checkpoint
+COMPACT_MARKER = "__compact_messages__"
+
+
+class CompactSqliteSaver(AsyncSqliteSaver):
+    """
+    SQLite checkpointer that stores each thread's messages once, as deltas.
+
+    The stock saver serializes the full message list into every checkpoint, so
+    a thread of N messages costs O(N^2) bytes on disk. Here the list is
+    replaced by a marker holding its length, and the messages live in a
+    `checkpoint_messages` table keyed by position: each checkpoint only
+    appends the messages that are new since the previous one (or rewrites the
+    tail if earlier messages changed).
+
+    Only the newest `keep_checkpoints` checkpoints per thread are kept, and a
+    thread's messages are read from disk when the thread is resumed, with at
+    most `max_cached_threads` threads held in memory.
+
+    Checkpoints that predate a rewrite of the tail resolve against the current
+    message rows, so time-travel to pruned-over history is approximate.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection, *, serde=None, keep_checkpoints: int = None,
+                 max_cached_threads: int = None):
+        super().__init__(conn, serde=serde)
+        self.keep_checkpoints = config.CHECKPOINT_KEEP if keep_checkpoints is None else keep_checkpoints
+        self.max_cached_threads = max_cached_threads or config.CHECKPOINT_CACHED_THREADS
+        # (thread_id, checkpoint_ns) -> [(fingerprint, message)] mirroring checkpoint_messages
+        self._threads = OrderedDict()
+        self._messages_ready = False
+
+    @classmethod
+    @asynccontextmanager
+    async def from_path(cls, path: str = None, **kwargs):
+        """
+        Open (creating if needed) a checkpoint database file.
+
+        Args:
+            path (str): SQLite file. Defaults to config.CHECKPOINT_DB_PATH.
+            **kwargs: Passed to the constructor.
+        """
+        path = path or config.CHECKPOINT_DB_PATH
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        async with aiosqlite.connect(path) as conn:
+            yield cls(conn, **kwargs)
+
+    async def setup(self) -> None:
+        await super().setup()
+        if self._messages_ready:
+            return
+        async with self.lock:
+            await self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoint_messages (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    idx INTEGER NOT NULL,
+                    type TEXT,
+                    value BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, idx)
+                );
+                """
+            )
+            await self.conn.commit()
+            self._messages_ready = True
+
+    # ---- message store -----------------------------------------------------
+
+    @staticmethod
+    def _fingerprint(message):
+        # str hashes are cached on the object, so re-fingerprinting a long history is cheap
+        content = getattr(message, "content", "")
+        content = content if isinstance(content, str) else repr(content)
+        return getattr(message, "id", None), type(message).__name__, hash(content), len(content)
+
+    def _cache(self, key, stored):
+        self._threads[key] = stored
+        self._threads.move_to_end(key)
+        while len(self._threads) > self.max_cached_threads:
+            self._threads.popitem(last=False)
+
+    async def _thread_messages(self, thread_id: str, checkpoint_ns: str) -> list:
+        """The stored messages of a thread, loaded from disk on first use."""
+        key = (thread_id, checkpoint_ns)
+        stored = self._threads.get(key)
+        if stored is not None:
+            self._threads.move_to_end(key)
+            return stored
+        async with self.lock, self.conn.execute(
+            "SELECT type, value FROM checkpoint_messages WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY idx",
+            key,
+        ) as cur:
+            rows = await cur.fetchall()
+        messages = [self.serde.loads_typed((type_, value)) for type_, value in rows]
+        stored = [(self._fingerprint(m), m) for m in messages]
+        self._cache(key, stored)
+        return stored
+
+    async def _store_messages(self, thread_id: str, checkpoint_ns: str, messages: list):
+        """Write the part of `messages` that differs from what is stored."""
+        stored = await self._thread_messages(thread_id, checkpoint_ns)
+        fingerprints = [self._fingerprint(m) for m in messages]
+        first = 0
+        shared = min(len(stored), len(fingerprints))
+        while first < shared and stored[first][0] == fingerprints[first]:
+            first += 1
+        if first == len(stored) == len(messages):
+            return
+
+        async with self.lock, self.conn.cursor() as cur:
+            await cur.execute(
+                "DELETE FROM checkpoint_messages WHERE thread_id = ? AND checkpoint_ns = ? AND idx >= ?",
+                (thread_id, checkpoint_ns, first),
+            )
+            await cur.executemany(
+                "INSERT INTO checkpoint_messages (thread_id, checkpoint_ns, idx, type, value) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (thread_id, checkpoint_ns, idx, *self.serde.dumps_typed(message))
+                    for idx, message in enumerate(messages[first:], start=first)
+                ],
+            )
+            await self.conn.commit()
+        self._cache((thread_id, checkpoint_ns), list(zip(fingerprints, messages)))
+
+    async def _expand(self, checkpoint_tuple):
+        """Replace the message marker of a loaded checkpoint with the actual messages."""
+        if checkpoint_tuple is None:
+            return None
+        values = checkpoint_tuple.checkpoint.get("channel_values") or {}
+        marker = values.get(MESSAGES_CHANNEL)
+        if isinstance(marker, dict) and COMPACT_MARKER in marker:
+            configurable = checkpoint_tuple.config["configurable"]
+            stored = await self._thread_messages(str(configurable["thread_id"]),
+                                                 configurable.get("checkpoint_ns", ""))
+            checkpoint_tuple.checkpoint["channel_values"] = {
+                **values, MESSAGES_CHANNEL: [m for _, m in stored[:marker[COMPACT_MARKER]]]
+            }
+        return checkpoint_tuple
+
+    async def _prune(self, thread_id: str, checkpoint_ns: str):
+        """Drop all but the newest `keep_checkpoints` checkpoints (and their writes) of a thread."""
+        if not self.keep_checkpoints:
+            return
+        params = (thread_id, checkpoint_ns, thread_id, checkpoint_ns)
+        async with self.lock, self.conn.cursor() as cur:
+            await cur.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN ("
+                " SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+                " ORDER BY checkpoint_id DESC LIMIT ?)",
+                (*params, self.keep_checkpoints),
+            )
+            if cur.rowcount:
+                await cur.execute(
+                    "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN ("
+                    " SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?)",
+                    params,
+                )
+            await self.conn.commit()
+
+    # ---- BaseCheckpointSaver -----------------------------------------------
+
+    async def aget_tuple(self, config):
+        return await self._expand(await super().aget_tuple(config))
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        # The parent holds the connection lock while it yields; collect first, then expand
+        checkpoint_tuples = [t async for t in super().alist(config, filter=filter, before=before, limit=limit)]
+        for checkpoint_tuple in checkpoint_tuples:
+            yield await self._expand(checkpoint_tuple)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        await self.setup()
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        values = checkpoint.get("channel_values") or {}
+        messages = values.get(MESSAGES_CHANNEL)
+        if isinstance(messages, list):
+            await self._store_messages(thread_id, checkpoint_ns, messages)
+            checkpoint = {**checkpoint, "channel_values": {**values, MESSAGES_CHANNEL: {COMPACT_MARKER: len(messages)}}}
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        await self._prune(thread_id, checkpoint_ns)
+        return next_config
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await super().adelete_thread(thread_id)
+        async with self.lock, self.conn.cursor() as cur:
+            await cur.execute("DELETE FROM checkpoint_messages WHERE thread_id = ?", (str(thread_id),))
+            await self.conn.commit()
+        for key in [key for key in self._threads if key[0] == str(thread_id)]:
+            del self._threads[key]
+
+    async def ahas_thread(self, thread_id: str) -> bool:
+        """Whether any checkpoint exists for `thread_id`, without loading it."""
+        await self.setup()
+        async with self.lock, self.conn.execute(
+            "SELECT 1 FROM checkpoints WHERE thread_id = ? LIMIT 1", (str(thread_id),)
+        ) as cur:
+            return await cur.fetchone() is not None
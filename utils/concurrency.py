@@ -0,0 +1,86 @@
+# MCP_PROJECT/utils/concurrency.py
+
+import asyncio
+import inspect
+import time
+from contextlib import asynccontextmanager
+from utils import config
+from utils.metrics import metrics
+
+
+class DependencyLimiter:
+    """
+    Caps concurrent calls to one upstream dependency and bounds their duration.
+
+    Coroutine functions are awaited directly; blocking functions are offloaded
+    to the default thread pool so they never stall the event loop.
+
+    Time spent queueing for a slot is recorded as `<name>.wait` and the call
+    itself as `upstream.<name>`, with `.errors` and `.timeouts` counters.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created on first use so it belongs to the running server loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Call `func(*args, **kwargs)` within this dependency's limits.
+
+        Raises:
+            RuntimeError: If the call does not finish within the timeout.
+        """
+        queued = time.perf_counter()
+        async with self.semaphore:
+            metrics.observe(f"{self.name}.wait", (time.perf_counter() - queued) * 1000)
+            if inspect.iscoroutinefunction(func):
+                awaitable = func(*args, **kwargs)
+            else:
+                awaitable = asyncio.to_thread(func, *args, **kwargs)
+            try:
+                with metrics.timer(f"upstream.{self.name}"):
+                    return await asyncio.wait_for(awaitable, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                metrics.incr(f"upstream.{self.name}.timeouts")
+                raise RuntimeError(f"{self.name} call timed out after {self.timeout:.0f}s")
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one concurrency slot for a block of work, e.g. consuming a stream.
+
+        Raises:
+            RuntimeError: If the block does not finish within the timeout.
+        """
+        queued = time.perf_counter()
+        async with self.semaphore:
+            metrics.observe(f"{self.name}.wait", (time.perf_counter() - queued) * 1000)
+            try:
+                with metrics.timer(f"upstream.{self.name}"):
+                    async with asyncio.timeout(self.timeout):
+                        yield
+            except TimeoutError:
+                metrics.incr(f"upstream.{self.name}.timeouts")
+                raise RuntimeError(f"{self.name} call timed out after {self.timeout:.0f}s")
+
+
+limiters = {
+    "embeddings": DependencyLimiter("embeddings", config.EMBEDDINGS_CONCURRENCY, config.EMBEDDINGS_TIMEOUT),
+    "vector_store": DependencyLimiter("vector_store", config.VECTOR_STORE_CONCURRENCY, config.VECTOR_STORE_TIMEOUT),
+    "llm": DependencyLimiter("llm", config.LLM_CONCURRENCY, config.LLM_TIMEOUT),
+    "web_search": DependencyLimiter("web_search", config.WEB_SEARCH_CONCURRENCY, config.WEB_SEARCH_TIMEOUT),
+}
+
+
+async def call_limited(dependency: str, func, *args, **kwargs):
+    """Run `func` under the limiter registered for `dependency`."""
+    return await limiters[dependency].run(func, *args, **kwargs)
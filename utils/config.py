@@ -0,0 +1,124 @@
+# MCP_PROJECT/utils/config.py
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Corpus / chunking
+DOCUMENTS_DIR = os.getenv("DOCUMENTS_DIR", os.path.join(PROJECT_ROOT, "documents"))
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
+PDF_LOADER_BACKEND = os.getenv("PDF_LOADER_BACKEND", "pypdf").lower()  # pypdf | pymupdf
+PDF_LOADER_WORKERS = int(os.getenv("PDF_LOADER_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_LOADER_PARALLEL_MIN_BYTES = int(os.getenv("PDF_LOADER_PARALLEL_MIN_BYTES", str(8 * 1024 * 1024)))
+
+# MCP server
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "sse").lower()  # stdio | sse | streamable-http
+MCP_HOST = os.getenv("MCP_HOST", "0.0.0.0")
+MCP_PORT = int(os.getenv("MCP_PORT", "8050"))
+# Worker processes for streamable-http (stateless, so any worker can take any request)
+MCP_WORKERS = int(os.getenv("MCP_WORKERS", "1"))
+
+# Local state (manifests, caches, snapshots)
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache"))
+
+# Vector store: "pinecone" (remote) or "local" (in-process NumPy/FAISS, no network)
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "pinecone").lower()
+PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "agentic-rag-pinecone")
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", os.path.join(CACHE_DIR, "local_index"))
+LOCAL_INDEX_TYPE = os.getenv("LOCAL_INDEX_TYPE", "numpy").lower()  # numpy | faiss-flat | faiss-hnsw
+# Storage precision of the local matrix: none (float32) | float16 | int8
+LOCAL_INDEX_QUANTIZATION = os.getenv("LOCAL_INDEX_QUANTIZATION", "none").lower()
+INDEX_MANIFEST_PATH = os.getenv(
+    "INDEX_MANIFEST_PATH", os.path.join(CACHE_DIR, f"index_manifest-{VECTOR_STORE_BACKEND}.json")
+)
+
+# Corpus snapshot shared read-only by multi-worker servers
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join(CACHE_DIR, f"corpus_snapshot-{VECTOR_STORE_BACKEND}.json"))
+
+# Retrieval
+TOP_K = int(os.getenv("TOP_K", "3"))
+MAX_TOP_K = int(os.getenv("MAX_TOP_K", "20"))
+MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", "10"))
+# Default size of the chunks returned by retrieve_chunks_tool (0 = no limit)
+RETRIEVAL_TOKEN_BUDGET = int(os.getenv("RETRIEVAL_TOKEN_BUDGET", "2000"))
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid").lower()  # hybrid | vector | lexical
+# Candidates each first-stage retriever contributes before fusion / reranking
+RETRIEVAL_CANDIDATES = int(os.getenv("RETRIEVAL_CANDIDATES", "20"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+BM25_K1 = float(os.getenv("BM25_K1", "1.5"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+RERANKER_ENABLED = os.getenv("RERANKER_ENABLED", "false").lower() in ("1", "true", "yes")
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+WARM_UP_TIMEOUT = float(os.getenv("WARM_UP_TIMEOUT", "300"))
+
+# Ingestion pipeline
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", "100"))
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+RETRY_BACKOFF_SECONDS = float(os.getenv("RETRY_BACKOFF_SECONDS", "1.0"))
+
+# Embeddings: "openai" (API) or "local" (sentence-transformers on this machine)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai").lower()
+EMBEDDING_MODEL = os.getenv(
+    "EMBEDDING_MODEL",
+    "sentence-transformers/all-MiniLM-L6-v2" if EMBEDDING_PROVIDER == "local" else "text-embedding-3-small",
+)
+# Shorten vectors to this size (text-embedding-3 / Matryoshka models); 0 = the model's native size
+EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", "0"))
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+EMBEDDING_LOCAL_BATCH_SIZE = int(os.getenv("EMBEDDING_LOCAL_BATCH_SIZE", "32"))
+EMBEDDING_LOCAL_WORKERS = int(os.getenv("EMBEDDING_LOCAL_WORKERS", "2"))
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite3"))
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "4096"))
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Summarization LLM
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0"))
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1024"))
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") or None
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
+# Client conversation memory
+CONVERSATION_TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", "6000"))
+TOOL_RESULT_TOKEN_LIMIT = int(os.getenv("TOOL_RESULT_TOKEN_LIMIT", "1500"))
+# Agent thread checkpoints (client_new.py)
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", os.path.join(CACHE_DIR, "checkpoints.sqlite3"))
+CHECKPOINT_KEEP = int(os.getenv("CHECKPOINT_KEEP", "20"))
+CHECKPOINT_CACHED_THREADS = int(os.getenv("CHECKPOINT_CACHED_THREADS", "8"))
+
+# Web search client
+WEB_SEARCH_BACKEND = os.getenv("WEB_SEARCH_BACKEND", "duckduckgo").lower()  # duckduckgo | fake
+WEB_SEARCH_MAX_RESULTS = int(os.getenv("WEB_SEARCH_MAX_RESULTS", "5"))
+WEB_SEARCH_CACHE_TTL_SECONDS = float(os.getenv("WEB_SEARCH_CACHE_TTL_SECONDS", "900"))
+WEB_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("WEB_SEARCH_CACHE_MAX_ENTRIES", "512"))
+WEB_SEARCH_RATE_PER_SECOND = float(os.getenv("WEB_SEARCH_RATE_PER_SECOND", "1.0"))
+WEB_SEARCH_BURST = int(os.getenv("WEB_SEARCH_BURST", "3"))
+
+# Per-dependency concurrency limits and timeouts (seconds) for the async tools
+EMBEDDINGS_CONCURRENCY = int(os.getenv("EMBEDDINGS_CONCURRENCY", "16"))
+EMBEDDINGS_TIMEOUT = float(os.getenv("EMBEDDINGS_TIMEOUT", "30"))
+VECTOR_STORE_CONCURRENCY = int(os.getenv("VECTOR_STORE_CONCURRENCY", "16"))
+VECTOR_STORE_TIMEOUT = float(os.getenv("VECTOR_STORE_TIMEOUT", "15"))
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+WEB_SEARCH_CONCURRENCY = int(os.getenv("WEB_SEARCH_CONCURRENCY", "4"))
+WEB_SEARCH_TIMEOUT = float(os.getenv("WEB_SEARCH_TIMEOUT", "20"))
+
+# Answer cache for document_retrieval_tool
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1024"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+
+# Instrumentation
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Recent samples kept per latency histogram for percentiles
+METRICS_WINDOW = int(os.getenv("METRICS_WINDOW", "2048"))
+OTEL_ENABLED = os.getenv("OTEL_ENABLED", "false").lower() in ("1", "true", "yes")
@@ -0,0 +1,242 @@
+# MCP_PROJECT/utils/conversation_memory.py
+
+import json
+from utils import config
+
+
+def _role(message):
+    if isinstance(message, dict):
+        return message.get("role", "")
+    role = getattr(message, "role", None) or getattr(message, "type", "")
+    return {"human": "user", "ai": "assistant"}.get(role, role)
+
+
+def _content(message):
+    content = message.get("content") if isinstance(message, dict) else getattr(message, "content", "")
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content or ""
+
+
+def _tool_calls(message):
+    tool_calls = message.get("tool_calls") if isinstance(message, dict) else getattr(message, "tool_calls", None)
+    return tool_calls or []
+
+
+class TokenCounter:
+    """
+    Approximate chat-token counter (tiktoken when available, ~4 chars/token otherwise).
+
+    Counts for messages that carry an `id` (LangChain messages) are cached, so
+    re-counting a growing history only costs the new messages.
+    """
+
+    # Per-message framing overhead used by the OpenAI chat format
+    MESSAGE_OVERHEAD = 4
+
+    def __init__(self, model: str = "gpt-4o-mini"):
+        self.model = model
+        self._encoding = None
+        self._cache = {}
+
+    def preload(self):
+        """Load the tokenizer now rather than on the first count; it may download its encoding file."""
+        if self._encoding is None:
+            try:
+                import tiktoken
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    self._encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:
+                # tiktoken missing, or its encoding file cannot be downloaded (offline)
+                self._encoding = False
+
+    def _encode_len(self, text: str) -> int:
+        self.preload()
+        if self._encoding is False:
+            return max(1, len(text) // 4)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def count_text(self, text: str) -> int:
+        return self._encode_len(text) if text else 0
+
+    def count_message(self, message) -> int:
+        key = None if isinstance(message, dict) else getattr(message, "id", None)
+        if key is not None and key in self._cache:
+            return self._cache[key]
+
+        tokens = self.MESSAGE_OVERHEAD + self.count_text(_content(message))
+        for call in _tool_calls(message):
+            if isinstance(call, dict):
+                function = call.get("function") or {}
+                tokens += self.count_text(str(function.get("name") or call.get("name") or ""))
+                tokens += self.count_text(str(function.get("arguments") or json.dumps(call.get("args", {}))))
+            else:
+                tokens += self.count_text(call.function.name) + self.count_text(call.function.arguments or "")
+
+        if key is not None:
+            self._cache[key] = tokens
+        return tokens
+
+
+def compress_tool_result(message, max_tokens: int, counter: TokenCounter):
+    """
+    Shorten an oversized tool result, keeping its head and tail.
+
+    Returns the original message when it is not a tool result or already fits.
+    """
+    if _role(message) != "tool":
+        return message
+    content = _content(message)
+    # A token is at least one character, so short results skip tokenization
+    if len(content) <= max_tokens or counter.count_text(content) <= max_tokens:
+        return message
+
+    # Keep roughly max_tokens worth of characters split between head and tail
+    keep_chars = max_tokens * 4
+    head, tail = content[: keep_chars * 3 // 4], content[-(keep_chars // 4):]
+    omitted = len(content) - len(head) - len(tail)
+    compressed = f"{head}\n...[{omitted} characters of tool output omitted]...\n{tail}"
+
+    if isinstance(message, dict):
+        return {**message, "content": compressed}
+    return message.model_copy(update={"content": compressed})
+
+
+def split_turns(messages):
+    """Split a history into (leading system messages, turns); each turn starts at a user message."""
+    head = []
+    index = 0
+    while index < len(messages) and _role(messages[index]) == "system":
+        head.append(messages[index])
+        index += 1
+
+    turns = []
+    for message in messages[index:]:
+        if _role(message) == "user" or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return head, turns
+
+
+def fit_to_budget(messages, token_budget: int, counter: TokenCounter, count=None):
+    """
+    Drop the oldest whole turns until the history fits the token budget.
+
+    Leading system messages and the latest turn are always kept. Whole turns
+    are dropped so an assistant tool_calls message is never separated from
+    its tool results.
+
+    Args:
+        count (callable): Per-message token count; defaults to `counter.count_message`.
+
+    Returns:
+        tuple: (kept messages, dropped messages, prompt tokens of the kept messages)
+    """
+    count = count or counter.count_message
+    head, turns = split_turns(messages)
+    head_tokens = sum(count(m) for m in head)
+    turn_tokens = [sum(count(m) for m in turn) for turn in turns]
+
+    total = head_tokens + sum(turn_tokens)
+    first_kept = 0
+    while total > token_budget and first_kept < len(turns) - 1:
+        total -= turn_tokens[first_kept]
+        first_kept += 1
+
+    dropped = [m for turn in turns[:first_kept] for m in turn]
+    kept = head + [m for turn in turns[first_kept:] for m in turn]
+    return kept, dropped, total
+
+
+class ConversationMemory:
+    """
+    Token-budgeted chat history for the OpenAI client.
+
+    Tool results are compressed as they are appended, and once the history
+    exceeds `token_budget` the oldest turns are dropped (or folded into a
+    running summary when a `summarizer` is given). Memory therefore stays
+    bounded and every request resends at most roughly `token_budget` tokens.
+    """
+
+    def __init__(self, token_budget: int = None, max_tool_result_tokens: int = None,
+                 model: str = "gpt-4o-mini", summarizer=None):
+        """
+        Args:
+            token_budget (int): Prompt-token budget for the history. Defaults to config.CONVERSATION_TOKEN_BUDGET.
+            max_tool_result_tokens (int): Cap for a single tool result. Defaults to config.TOOL_RESULT_TOKEN_LIMIT.
+            model (str): Model name used to pick the tokenizer.
+            summarizer (callable): Optional `(previous_summary, dropped_messages) -> str`.
+        """
+        self.token_budget = token_budget or config.CONVERSATION_TOKEN_BUDGET
+        self.max_tool_result_tokens = max_tool_result_tokens or config.TOOL_RESULT_TOKEN_LIMIT
+        self.counter = TokenCounter(model)
+        self.summarizer = summarizer
+        self.summary = ""
+        self._messages = []
+        # Token count per stored message, keyed by id(); entries live exactly as long as the message
+        self._counts = {}
+        self.last_prompt_tokens = 0
+
+    def append(self, message):
+        message = compress_tool_result(message, self.max_tool_result_tokens, self.counter)
+        self._counts[id(message)] = self.counter.count_message(message)
+        self._messages.append(message)
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+    def __len__(self):
+        return len(self._messages)
+
+    def window(self) -> list:
+        """
+        Messages to send with the next request, trimmed to the token budget.
+
+        Dropped turns are removed from memory for good.
+        """
+        budget = self.token_budget
+        summary_message = None
+        if self.summary:
+            summary_message = {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+            budget -= self.counter.count_message(summary_message)
+
+        kept, dropped, tokens = fit_to_budget(self._messages, budget, self.counter,
+                                              count=lambda m: self._counts[id(m)])
+        if dropped:
+            self._messages = kept
+            for message in dropped:
+                self._counts.pop(id(message), None)
+            if self.summarizer:
+                self.summary = self.summarizer(self.summary, dropped)
+                summary_message = {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+
+        if summary_message is None:
+            self.last_prompt_tokens = tokens
+            return list(kept)
+
+        head, turns = split_turns(kept)
+        self.last_prompt_tokens = tokens + self.counter.count_message(summary_message)
+        return head + [summary_message] + [m for turn in turns for m in turn]
+
+
+def make_pre_model_hook(token_budget: int = None, max_tool_result_tokens: int = None, model: str = "gpt-4o"):
+    """
+    The same trimming policy as a LangGraph `pre_model_hook` for `create_react_agent`.
+
+    The checkpointed state keeps the full history; only the messages sent to
+    the model (`llm_input_messages`) are compressed and trimmed.
+    """
+    token_budget = token_budget or config.CONVERSATION_TOKEN_BUDGET
+    max_tool_result_tokens = max_tool_result_tokens or config.TOOL_RESULT_TOKEN_LIMIT
+    counter = TokenCounter(model)
+
+    def pre_model_hook(state):
+        messages = [compress_tool_result(m, max_tool_result_tokens, counter) for m in state["messages"]]
+        kept, _, tokens = fit_to_budget(messages, token_budget, counter)
+        print(f"[prompt: {tokens} tokens, {len(kept)}/{len(messages)} messages]")
+        return {"llm_input_messages": kept}
+
+    return pre_model_hook
@@ -0,0 +1,65 @@
+# MCP_PROJECT/utils/deferred.py
+
+import asyncio
+import importlib
+import sys
+import threading
+
+# The retrieval, LLM and web-search stacks (langchain, OpenAI, Pinecone, NumPy,
+# DuckDuckGo). Tools import them on first use so the server answers
+# `initialize` / `list_tools` before they are loaded.
+HEAVY_MODULES = (
+    "utils.retriever",
+    "utils.openai_call",
+    "utils.answer_cache",
+    "utils.search_client",
+)
+
+
+def _loaded(name: str):
+    """The module if it is fully imported, else None (also while another thread is importing it)."""
+    module = sys.modules.get(name)
+    if module is None or getattr(module.__spec__, "_initializing", False):
+        return None
+    return module
+
+
+async def aimport(name: str):
+    """
+    Import a module from a coroutine without blocking the event loop.
+
+    A module that is already loaded is returned directly; otherwise the import
+    (or the wait for a background import of it) runs in a worker thread.
+
+    Args:
+        name (str): Dotted module name, e.g. "utils.retriever".
+
+    Returns:
+        module: The imported module.
+    """
+    return _loaded(name) or await asyncio.to_thread(importlib.import_module, name)
+
+
+def import_in_background(names=HEAVY_MODULES, then=None) -> threading.Thread:
+    """
+    Import `names` in a daemon thread, then call `then()` from that thread.
+
+    Args:
+        names (tuple): Modules to import, in order.
+        then (callable): Run once every import has finished, e.g. to start ingestion.
+
+    Returns:
+        threading.Thread: The started thread.
+    """
+    def _run():
+        try:
+            for name in names:
+                importlib.import_module(name)
+            if then is not None:
+                then()
+        except Exception as e:
+            print(f"Background warm-up failed: {e}", file=sys.stderr)
+
+    thread = threading.Thread(target=_run, name="import-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -1,83 +1,182 @@
 # MCP_PROJECT/utils/document_utils.py
 
-from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from bisect import bisect_right
+from itertools import groupby
+import multiprocessing
 import os
+from utils import config
 
 
-def load_pdf(folder_path):
+def _read_pdf_pages(file_path, backend):
     """
-    Loads all PDF files from a given folder.
-    
+    Parse one PDF into (page_content, metadata) tuples.
+
+    Runs inside a worker process, so it returns plain picklable tuples and
+    imports the parser lazily.
+    """
+    if backend == "pymupdf":
+        import fitz
+        with fitz.open(file_path) as pdf:
+            total_pages = pdf.page_count
+            return [
+                (page.get_text(), {
+                    "source": file_path,
+                    "page": page.number,
+                    "page_label": page.get_label() or str(page.number + 1),
+                    "total_pages": total_pages,
+                })
+                for page in pdf
+            ]
+
+    from langchain_community.document_loaders import PyPDFLoader
+    return [(doc.page_content, doc.metadata) for doc in PyPDFLoader(file_path).load()]
+
+
+def iter_pdf_pages(folder_path, max_workers=None, backend=None):
+    """
+    Stream the pages of every PDF in a folder, parsing files in parallel.
+
+    Files are parsed in a process pool, at most `2 * max_workers` files ahead
+    of the consumer, and their pages are yielded in file order. Only the files
+    in that window are held in memory, whatever the size of the corpus.
+
     Args:
         folder_path (str): Path to the folder containing PDFs.
+        max_workers (int): Parser processes. Defaults to config.PDF_LOADER_WORKERS; 1 parses inline,
+            as do corpora smaller than config.PDF_LOADER_PARALLEL_MIN_BYTES.
+        backend (str): "pypdf" (PyPDFLoader) or "pymupdf". Defaults to config.PDF_LOADER_BACKEND.
 
-    Returns:
-        list: A list of documents loaded from all PDFs.
+    Yields:
+        Document: One document per page.
     """
-    
-    documents = []
-    full_text = ""
+    max_workers = max_workers or config.PDF_LOADER_WORKERS
+    backend = backend or config.PDF_LOADER_BACKEND
     try:
-        for file_name in os.listdir(folder_path):
-            if file_name.endswith(".pdf"):
-                file_path = os.path.join(folder_path, file_name)
-                loader = PyPDFLoader(file_path)
-                documents.extend(loader.load())
-                for doc in documents:
-                    full_text += doc.page_content
-        return documents, full_text
+        file_paths = [
+            os.path.join(folder_path, file_name)
+            for file_name in sorted(os.listdir(folder_path))
+            if file_name.endswith(".pdf")
+        ]
+
+        # Spawning parser processes costs about a second, only worth it for larger corpora
+        total_bytes = sum(os.path.getsize(file_path) for file_path in file_paths)
+        if max_workers <= 1 or len(file_paths) <= 1 or total_bytes < config.PDF_LOADER_PARALLEL_MIN_BYTES:
+            for file_path in file_paths:
+                for page_content, metadata in _read_pdf_pages(file_path, backend):
+                    yield Document(page_content=page_content, metadata=metadata)
+            return
+
+        # spawn: forking a process that already runs server threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            remaining = iter(file_paths)
+            in_flight = deque()
+            for file_path in remaining:
+                in_flight.append(executor.submit(_read_pdf_pages, file_path, backend))
+                if len(in_flight) >= 2 * max_workers:
+                    break
+            while in_flight:
+                pages = in_flight.popleft().result()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    in_flight.append(executor.submit(_read_pdf_pages, next_path, backend))
+                for page_content, metadata in pages:
+                    yield Document(page_content=page_content, metadata=metadata)
     except Exception as e:
         raise RuntimeError(f"An error occurred while reading the PDF file: {e}")
 
 
+def load_pdf(folder_path):
+    """
+    Loads all PDF files from a given folder.
+
+    Prefer `iter_pdf_pages` when the pages are consumed once (e.g. by `chunk_text`).
 
-def chunk_text(documents, full_text, CHUNK_SIZE, CHUNK_OVERLAP):
+    Args:
+        folder_path (str): Path to the folder containing PDFs.
+
+    Returns:
+        list: A list of page documents loaded from all PDFs.
+    """
+    return list(iter_pdf_pages(folder_path))
+
+
+def _page_label(metadata):
+    """Human-readable page label for a page's metadata (falls back to 1-based page number)."""
+    if metadata.get("page_label") is not None:
+        return str(metadata["page_label"])
+    return str(int(metadata.get("page", 0)) + 1)
+
+
+def chunk_text(documents, CHUNK_SIZE, CHUNK_OVERLAP):
     """
-    Split the text into chunks and assign metadata to each chunk.
-    
+    Split the documents into chunks and assign source/page metadata to each chunk.
+
+    Pages of the same source are concatenated while recording the offset at
+    which each page starts. Every chunk's offset in that text is tracked as it
+    is produced, and its page(s) are found with a binary search over the page
+    offsets, so attribution is O(chunks * log pages). Chunks that cross a page
+    boundary are labelled with every page they span (e.g. "3,4").
+
     Args:
-        documents (list): A list of documents.
-        full_text (str): The full text to be split into chunks.
-    
+        documents (Iterable): Page documents in reading order, e.g. the `iter_pdf_pages` stream.
+            Consumed one source file at a time.
+        CHUNK_SIZE (int): Maximum chunk length in characters.
+        CHUNK_OVERLAP (int): Overlap between consecutive chunks in characters.
+
     Returns:
         list: A list of chunks with metadata.
     """
-    
-    # Split the text into chunks and assign metadata to each chunk
+
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=CHUNK_SIZE,
         chunk_overlap=CHUNK_OVERLAP,
         separators=["\n\n", "\n", " ", ""],
         length_function=len
     )
-    raw_chunks = text_splitter.split_text(full_text)
 
-    # Assign metadata to chunks
     chunks = []
-    for doc in documents:
-        current_page_text = doc.page_content
-        current_page_metadata = doc.metadata
-        for chunk in raw_chunks:
-            if chunk in current_page_text or chunk[:50] in current_page_text:
-                if not chunk in current_page_text:
-                    chunks.append(
-                        {
-                            "text": chunk.strip(),
-                            "metadata": {
-                                "source":current_page_metadata["source"],
-                                "page":current_page_metadata["page_label"] + "," + str(int(current_page_metadata["page_label"]) + 1)
-                            }
-                        }
-                    )
-                    break
-                chunks.append(
-                        {
-                            "text": chunk.strip(),
-                            "metadata": {
-                                "source":current_page_metadata["source"],
-                                "page":current_page_metadata["page_label"]
-                            }
-                        }
-                    )
+    # Pages of one file arrive contiguously; never let a chunk span two files
+    for source, pages in groupby(documents, key=lambda doc: doc.metadata.get("source", "")):
+        page_starts = []
+        page_labels = []
+        parts = []
+        offset = 0
+        for page in pages:
+            page_starts.append(offset)
+            page_labels.append(_page_label(page.metadata))
+            parts.append(page.page_content)
+            offset += len(page.page_content)
+        text = "".join(parts)
+
+        # As langchain's `add_start_index`: the next chunk starts no earlier than the
+        # previous one's end minus the overlap, so text repeated on an earlier page is skipped
+        start = 0
+        previous_len = 0
+        for raw_chunk in text_splitter.split_text(text):
+            search_from = max(0, start + previous_len - CHUNK_OVERLAP)
+            found = text.find(raw_chunk, search_from)
+            start = found if found != -1 else search_from
+            end = start + len(raw_chunk)
+            previous_len = len(raw_chunk)
+
+            first_page = bisect_right(page_starts, start) - 1
+            last_page = bisect_right(page_starts, max(start, end - 1)) - 1
+
+            chunk = raw_chunk.strip()
+            if not chunk:
+                continue
+            chunks.append(
+                {
+                    "text": chunk,
+                    "metadata": {
+                        "source": source,
+                        "page": ",".join(page_labels[first_page:last_page + 1])
+                    }
+                }
+            )
     return chunks
@@ -0,0 +1,250 @@
+# MCP_PROJECT/utils/embedding_cache.py
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from langchain_core.embeddings import Embeddings
+from utils.metrics import metrics
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper with an in-memory LRU tier and a persistent SQLite tier.
+
+    Vectors are keyed by (model, sha256(text)) and stored as float32 blobs.
+    Lookups go memory -> disk -> underlying model, and only the misses of a
+    batch are sent upstream. The disk tier is trimmed back under `max_bytes`
+    by evicting the least recently used rows.
+
+    The memory tier has its own lock, so the async methods check it inline and
+    only hand SQLite reads and writes to a worker thread; the event loop never
+    waits on the disk or on a bulk ingest holding the connection.
+    """
+
+    def __init__(self, underlying: Embeddings, model: str, cache_path: str,
+                 memory_items: int = 4096, max_bytes: int = 512 * 1024 * 1024):
+        self.underlying = underlying
+        self.model = model
+        self.cache_path = cache_path
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+        # Guards the SQLite connection
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL,"
+            " size INTEGER NOT NULL, last_access REAL NOT NULL,"
+            " PRIMARY KEY (model, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_lru ON embeddings (last_access)")
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    # ---- memory tier -------------------------------------------------------
+
+    def _memory_get(self, key):
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # ---- disk tier ---------------------------------------------------------
+
+    def _disk_get_many(self, keys):
+        found = {}
+        now = time.time()
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                [self.model, *batch],
+            ).fetchall()
+            for key, blob in rows:
+                vector = array("f")
+                vector.frombytes(blob)
+                found[key] = vector.tolist()
+        if found:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE model = ? AND key = ?",
+                [(now, self.model, key) for key in found],
+            )
+            self._conn.commit()
+        return found
+
+    def _disk_put_many(self, items):
+        now = time.time()
+        rows = []
+        for key, vector in items:
+            blob = array("f", vector).tobytes()
+            rows.append((self.model, key, blob, len(blob), now))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, key, vector, size, last_access) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._disk_bytes += sum(row[3] for row in rows)
+        if self._disk_bytes > self.max_bytes:
+            self._evict()
+        self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used rows until the disk tier is at 90% of max_bytes."""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT rowid, size FROM embeddings ORDER BY last_access").fetchall()
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        doomed = []
+        for rowid, size in rows:
+            if total <= target:
+                break
+            doomed.append((rowid,))
+            total -= size
+        self._conn.executemany("DELETE FROM embeddings WHERE rowid = ?", doomed)
+        self._disk_bytes = total
+
+    # ---- lookup ------------------------------------------------------------
+
+    def _lookup_memory(self, texts):
+        """Return (keys, vectors with None for memory misses)."""
+        keys = [self._key(text) for text in texts]
+        vectors = [None] * len(texts)
+        with self._memory_lock:
+            for i, key in enumerate(keys):
+                vector = self._memory_get(key)
+                if vector is not None:
+                    vectors[i] = vector
+                    self.memory_hits += 1
+        return keys, vectors
+
+    def _lookup_disk(self, texts, keys, vectors):
+        """Fill memory misses in `vectors` from disk; return {key: text} of the unique misses left."""
+        disk_keys = list(dict.fromkeys(key for key, vector in zip(keys, vectors) if vector is None))
+        with self._lock:
+            found = self._disk_get_many(disk_keys) if disk_keys else {}
+        missing = {}
+        with self._memory_lock:
+            for i, key in enumerate(keys):
+                if vectors[i] is not None:
+                    continue
+                if key in found:
+                    vectors[i] = found[key]
+                    self._memory_put(key, found[key])
+                    self.disk_hits += 1
+                else:
+                    missing[key] = texts[i]
+                    self.misses += 1
+        return missing
+
+    def _lookup(self, texts):
+        """Return (keys, vectors with None for misses, {key: text} of unique misses)."""
+        keys, vectors = self._lookup_memory(texts)
+        missing = self._lookup_disk(texts, keys, vectors) if None in vectors else {}
+        return keys, vectors, missing
+
+    async def _alookup(self, texts):
+        keys, vectors = self._lookup_memory(texts)
+        missing = await asyncio.to_thread(self._lookup_disk, texts, keys, vectors) if None in vectors else {}
+        return keys, vectors, missing
+
+    def _store(self, computed):
+        with self._memory_lock:
+            for key, vector in computed.items():
+                self._memory_put(key, vector)
+        with self._lock:
+            self._disk_put_many(computed.items())
+
+    @staticmethod
+    def _fill(keys, vectors, computed):
+        return [vector if vector is not None else computed[key] for key, vector in zip(keys, vectors)]
+
+    def _count_upstream(self, texts):
+        metrics.incr("embeddings.upstream_requests")
+        metrics.incr("embeddings.upstream_texts", len(texts))
+        # ~4 characters per token: a tokenizer could need a download, and this runs on the event loop
+        metrics.incr("embeddings.upstream_tokens", sum(max(1, len(t) // 4) for t in texts))
+
+    # ---- Embeddings interface ----------------------------------------------
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, vectors, missing = self._lookup(texts)
+        if missing:
+            self._count_upstream(missing.values())
+            fresh = self.underlying.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), fresh))
+            self._store(computed)
+        else:
+            computed = {}
+        return self._fill(keys, vectors, computed)
+
+    def embed_query(self, text: str) -> list[float]:
+        keys, vectors, missing = self._lookup([text])
+        if not missing:
+            return vectors[0]
+        self._count_upstream([text])
+        vector = self.underlying.embed_query(text)
+        self._store({keys[0]: vector})
+        return vector
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, vectors, missing = await self._alookup(texts)
+        if missing:
+            self._count_upstream(missing.values())
+            fresh = await self.underlying.aembed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), fresh))
+            await asyncio.to_thread(self._store, computed)
+        else:
+            computed = {}
+        return self._fill(keys, vectors, computed)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        keys, vectors, missing = await self._alookup([text])
+        if not missing:
+            return vectors[0]
+        self._count_upstream([text])
+        vector = await self.underlying.aembed_query(text)
+        await asyncio.to_thread(self._store, {keys[0]: vector})
+        return vector
+
+    def stats(self) -> dict:
+        """Hit/miss counters and tier sizes."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "model": self.model,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_items": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def __getattr__(self, name):
+        # Expose attributes of the wrapped model (e.g. `model`, `dimensions`)
+        if name == "underlying":
+            raise AttributeError(name)
+        return getattr(self.underlying, name)
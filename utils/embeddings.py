@@ -1,12 +1,81 @@
 # MCP_PROJECT/utils/embeddings.py
 
 import os
-from langchain_openai.embeddings import OpenAIEmbeddings
-from dotenv import load_dotenv
+from utils import config
+from utils.embedding_cache import CachedEmbeddings
+from utils.metrics import metrics
 
-load_dotenv()
+# Output sizes of the OpenAI embedding models, so creating an index needs no API call
+OPENAI_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
 
-embeddings = OpenAIEmbeddings(
-    openai_api_key=os.getenv("OPENAI_API_KEY"),
-    model="text-embedding-3-small"
-)
\ No newline at end of file
+
+def create_embeddings(provider=None, model=None):
+    """
+    Build the embeddings client selected by config.EMBEDDING_PROVIDER.
+
+    Args:
+        provider (str): "openai" or "local". Defaults to config.EMBEDDING_PROVIDER.
+        model (str): Model name. Defaults to config.EMBEDDING_MODEL.
+
+    Returns:
+        Embeddings: The (uncached) embeddings client.
+    """
+    provider = (provider or config.EMBEDDING_PROVIDER).lower()
+    model = model or config.EMBEDDING_MODEL
+    if provider == "openai":
+        from langchain_openai.embeddings import OpenAIEmbeddings
+        kwargs = {"dimensions": config.EMBEDDING_DIMENSION} if config.EMBEDDING_DIMENSION else {}
+        return OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"), model=model, **kwargs)
+    if provider == "local":
+        from utils.local_embeddings import SentenceTransformerEmbeddings
+        return SentenceTransformerEmbeddings(
+            model,
+            device=config.EMBEDDING_DEVICE,
+            batch_size=config.EMBEDDING_LOCAL_BATCH_SIZE,
+            max_workers=config.EMBEDDING_LOCAL_WORKERS,
+            truncate_dim=config.EMBEDDING_DIMENSION or None,
+        )
+    raise ValueError(f"Unknown embedding provider: {provider}")
+
+
+def embedding_dimension() -> int:
+    """
+    Vector size produced by the configured embeddings, for creating an index.
+
+    Uses config.EMBEDDING_DIMENSION when set, then the model's own metadata,
+    and only as a last resort embeds a probe string.
+
+    Returns:
+        int: The embedding dimension.
+    """
+    if config.EMBEDDING_DIMENSION:
+        return config.EMBEDDING_DIMENSION
+    dimension = getattr(base_embeddings, "dimension", None) or OPENAI_DIMENSIONS.get(config.EMBEDDING_MODEL)
+    if dimension:
+        return dimension
+    try:
+        return len(base_embeddings.embed_query("dimension probe"))
+    except Exception as e:
+        raise RuntimeError(f"Could not determine the dimension of embedding model '{config.EMBEDDING_MODEL}': {e}")
+
+
+base_embeddings = create_embeddings()
+# Identifies the vector space: shortened vectors differ from full-size ones of the same model
+embedding_key = f"{config.EMBEDDING_MODEL}@{config.EMBEDDING_DIMENSION}" if config.EMBEDDING_DIMENSION else config.EMBEDDING_MODEL
+
+# Repeated texts (re-ingests, repeated queries) are served from the local cache
+if config.EMBEDDING_CACHE_ENABLED:
+    embeddings = CachedEmbeddings(
+        base_embeddings,
+        model=embedding_key,
+        cache_path=config.EMBEDDING_CACHE_PATH,
+        memory_items=config.EMBEDDING_CACHE_MEMORY_ITEMS,
+        max_bytes=config.EMBEDDING_CACHE_MAX_BYTES,
+    )
+    metrics.register_source("embedding_cache", embeddings.stats)
+else:
+    embeddings = base_embeddings
@@ -1,11 +1,12 @@
 # MCP_PROJECT/utils/initiate_mcp.py
 
 from mcp.server.fastmcp import FastMCP
+from utils import config
 
 # Define MCP instance once
 mcp = FastMCP(
     name="Agentic RAG MCP Server",
-    host="0.0.0.0",
-    port=8050,
+    host=config.MCP_HOST,
+    port=config.MCP_PORT,
     stateless_http=True
 )
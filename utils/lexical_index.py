@@ -0,0 +1,100 @@
+# MCP_PROJECT/utils/lexical_index.py
+
+import math
+import re
+from collections import Counter, defaultdict
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Very common English words that carry no lexical signal
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how in is it its of on or that the their "
+    "this to was were what when where which who why will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with stopwords removed."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-process Okapi BM25 index over the chunk texts.
+
+    Postings are kept as an inverted index (term -> [(row, term frequency)]),
+    so a query only touches the rows that contain at least one of its terms.
+    Rows are positions in the `ids` list given at build time.
+    """
+
+    def __init__(self, ids: list, texts: list[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            ids (list): Identifier of each document (chunk IDs).
+            texts (list[str]): Text of each document, aligned with `ids`.
+            k1 (float): Term-frequency saturation.
+            b (float): Document-length normalisation.
+        """
+        self.ids = list(ids)
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(list)
+        self._lengths = []
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            self._lengths.append(sum(counts.values()))
+            for term, frequency in counts.items():
+                self._postings[term].append((row, frequency))
+
+        total = len(self._lengths)
+        self._average_length = (sum(self._lengths) / total) if total else 0.0
+        self._idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query: str, top_k: int) -> list[tuple]:
+        """
+        Score the documents that share terms with the query.
+
+        Returns:
+            list: (id, score) tuples, best first, at most `top_k` of them.
+        """
+        if not self.ids or top_k <= 0:
+            return []
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for row, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[row] / self._average_length)
+                scores[row] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(self.ids[row], score) for row, score in best]
+
+
+def reciprocal_rank_fusion(rankings: list[list], k: int = 60) -> list[tuple]:
+    """
+    Fuse several ranked ID lists with reciprocal rank fusion.
+
+    Each ID scores sum(1 / (k + rank)) over the rankings it appears in, so
+    results ranked well by either retriever rise to the top without having
+    to calibrate BM25 against cosine scores.
+
+    Args:
+        rankings (list[list]): Ranked lists of IDs, best first.
+        k (int): Damping constant; larger values flatten the rank weights.
+
+    Returns:
+        list: (id, fused score) tuples, best first.
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
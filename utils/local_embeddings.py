@@ -0,0 +1,76 @@
+# MCP_PROJECT/utils/local_embeddings.py
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.embeddings import Embeddings
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    Local CPU/GPU embeddings with sentence-transformers; no network calls.
+
+    The model is loaded on first use. Texts are encoded in batches of
+    `batch_size`, and large inputs are split across `max_workers` threads
+    (inference releases the GIL). Async calls are handed to a second pool,
+    so embedding never blocks the event loop or the default executor, and a
+    call waiting on its slices never holds an inference worker.
+    Vectors are L2-normalised, matching OpenAI embeddings; `truncate_dim`
+    keeps only the leading dimensions (for Matryoshka-trained models).
+    """
+
+    def __init__(self, model_name: str, device: str = "cpu", batch_size: int = 32, max_workers: int = 2,
+                 truncate_dim: int = None):
+        self.model_name = model_name
+        self.truncate_dim = truncate_dim
+        self.device = device
+        self.batch_size = batch_size
+        self.max_workers = max(1, max_workers)
+        self._model = None
+        self._load_lock = threading.Lock()
+        # Inference slices only; these threads never wait on the pool themselves
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="local-embeddings")
+        self._async_executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                  thread_name_prefix="local-embeddings-async")
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError as e:
+                        raise RuntimeError(f"The local embeddings provider needs sentence-transformers: {e}")
+                    self._model = SentenceTransformer(self.model_name, device=self.device,
+                                                      truncate_dim=self.truncate_dim)
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        vectors = self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True,
+                                    convert_to_numpy=True, show_progress_bar=False)
+        return vectors.tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        texts = list(texts)
+        if len(texts) <= self.batch_size or self.max_workers == 1:
+            return self._encode(texts)
+        # One slice per worker, each still encoded in `batch_size` batches
+        step = -(-len(texts) // self.max_workers)
+        parts = self._executor.map(self._encode, [texts[i:i + step] for i in range(0, len(texts), step)])
+        return [vector for part in parts for vector in part]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._encode([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._async_executor, self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._async_executor, self.embed_query, text)
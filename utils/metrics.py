@@ -0,0 +1,193 @@
+# MCP_PROJECT/utils/metrics.py
+
+import functools
+import math
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from utils import config
+
+
+class Histogram:
+    """
+    Latency distribution over a sliding window of recent samples.
+
+    The last `window` observations are kept for percentiles; count, sum and
+    max cover the whole lifetime of the process.
+    """
+
+    def __init__(self, window: int):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float, ordered=None) -> float:
+        """Nearest-rank percentile (0-100) of the windowed samples."""
+        ordered = ordered if ordered is not None else sorted(self._samples)
+        if not ordered:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self) -> dict:
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50, ordered),
+            "p95_ms": self.percentile(95, ordered),
+            "p99_ms": self.percentile(99, ordered),
+            "max_ms": self.max,
+        }
+
+
+class Metrics:
+    """
+    Process-wide counters and latency histograms.
+
+    `timer()` measures a block (sync or inside a coroutine) into a histogram
+    in milliseconds and, when OpenTelemetry is enabled, wraps it in a span of
+    the same name. Recording is a dict lookup and a deque append under a lock,
+    cheap enough to leave on in production.
+    """
+
+    def __init__(self, enabled: bool = True, window: int = 2048, tracing: bool = False):
+        self.enabled = enabled
+        self.window = window
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._tracer = self._make_tracer() if tracing else None
+        # Extra stats merged into snapshots, e.g. cache hit counters owned by other modules
+        self._sources = {}
+
+    @staticmethod
+    def _make_tracer():
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            print("OTEL_ENABLED is set but opentelemetry-api is not installed; spans are disabled.", file=sys.stderr)
+            return None
+        # Uses the globally configured provider (e.g. from `opentelemetry-instrument`)
+        return trace.get_tracer("mcp_project")
+
+    def incr(self, name: str, value: float = 1):
+        """Add `value` to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, milliseconds: float):
+        """Record one latency sample."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.window)
+            histogram.observe(milliseconds)
+
+    @contextmanager
+    def timer(self, name: str, **attributes):
+        """
+        Time a block into the `name` histogram.
+
+        Exceptions are counted as `<name>.errors` and re-raised.
+
+        Args:
+            name (str): Metric (and span) name, e.g. "retrieval.search".
+            **attributes: Span attributes when tracing is enabled.
+        """
+        if not self.enabled:
+            yield
+            return
+        span = self._tracer.start_as_current_span(name, attributes=attributes) if self._tracer else None
+        start = time.perf_counter()
+        try:
+            if span is not None:
+                with span:
+                    yield
+            else:
+                yield
+        except BaseException:
+            self.incr(f"{name}.errors")
+            raise
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name: str):
+        """Decorator timing every call of a coroutine function (e.g. an MCP tool) into `name`."""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                self.incr(f"{name}.calls")
+                with self.timer(name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def register_source(self, name: str, stats):
+        """Include `stats()` (a dict of numbers) under `name` in every snapshot."""
+        self._sources[name] = stats
+
+    def snapshot(self) -> dict:
+        """Counters, histogram summaries and registered stats as one JSON-friendly dict."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {name: h.summary() for name, h in self._histograms.items()}
+        sources = {}
+        for name, stats in self._sources.items():
+            try:
+                sources[name] = stats()
+            except Exception as e:
+                sources[name] = {"error": str(e)}
+        return {
+            "uptime_seconds": time.time() - self.started_at,
+            "counters": counters,
+            "latency": histograms,
+            "stats": sources,
+        }
+
+    def prometheus(self) -> str:
+        """The snapshot in the Prometheus text exposition format."""
+        def metric_name(*parts):
+            return "mcp_" + re.sub(r"[^a-zA-Z0-9_]", "_", "_".join(parts))
+
+        snapshot = self.snapshot()
+        lines = [f"{metric_name('uptime_seconds')} {snapshot['uptime_seconds']:.3f}"]
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {metric_name(name, 'total')} counter")
+            lines.append(f"{metric_name(name, 'total')} {value}")
+        for name, summary in sorted(snapshot["latency"].items()):
+            base = metric_name(name, "ms")
+            lines.append(f"# TYPE {base} summary")
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'{base}{{quantile="{quantile}"}} {summary[key]:.3f}')
+            lines.append(f"{base}_count {summary['count']}")
+            lines.append(f"{base}_sum {summary['mean_ms'] * summary['count']:.3f}")
+        for source, stats in sorted(snapshot["stats"].items()):
+            for name, value in sorted(stats.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"{metric_name(source, name)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# Shared registry used across the server
+metrics = Metrics(enabled=config.METRICS_ENABLED, window=config.METRICS_WINDOW, tracing=config.OTEL_ENABLED)
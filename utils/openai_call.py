@@ -1,7 +1,98 @@
 # MCP_PROJECT/utils/openai_call.py
 
+import threading
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
+from utils import config
+
+PROMPT = ChatPromptTemplate.from_messages([
+    ("system",  "You are a helpful technical assistant that answers questions using only the provided context. "
+                "Keep responses concise, grounded in facts, and avoid speculation. Do not hallucinate or make up information."),
+
+    ("human",   "Based on the following context, answer the question below:\n\n"
+                "Question: {question}\n\n"
+                "Context:\n{context}")
+])
+
+# One call answering several questions over a shared, numbered context
+BATCH_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",  "You are a helpful technical assistant that answers questions using only the provided context. "
+                "Keep responses concise, grounded in facts, and avoid speculation. Do not hallucinate or make up information."),
+
+    ("human",   "Based on the following context, answer the questions below. {instructions}\n\n"
+                "Questions:\n{questions}\n\n"
+                "Context:\n{context}")
+])
+
+BATCH_INSTRUCTIONS = {
+    "per_query": "Answer each question separately under a heading that repeats its number and text. "
+                 "Each question lists the context passages retrieved for it.",
+    "combined": "Write one combined answer that covers all of the questions.",
+}
+
+
+class Summarizer:
+    """
+    Long-lived prompt | ChatOpenAI chain sharing pooled HTTP clients.
+
+    Built once and reused by every call, so requests keep their TCP/TLS
+    connections alive instead of paying client and chain setup each time.
+    """
+
+    def __init__(self, model=None, temperature=None, max_tokens=None, timeout=None, base_url=None,
+                 max_connections=None):
+        limits = httpx.Limits(
+            max_connections=max_connections or config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=max_connections or config.LLM_MAX_CONNECTIONS,
+        )
+        timeout = timeout or config.LLM_TIMEOUT
+        self.http_client = httpx.Client(limits=limits, timeout=timeout)
+        self.http_async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self.llm = ChatOpenAI(
+            model=model or config.LLM_MODEL,
+            temperature=config.LLM_TEMPERATURE if temperature is None else temperature,
+            max_tokens=max_tokens or config.LLM_MAX_TOKENS,
+            timeout=timeout,
+            base_url=base_url or config.LLM_BASE_URL,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
+        )
+        self.chain = PROMPT | self.llm
+        self.batch_chain = BATCH_PROMPT | self.llm
+
+    def summarize(self, question: str, context: str) -> str:
+        return self.chain.invoke({"question": question, "context": context}).content
+
+    async def asummarize(self, question: str, context: str) -> str:
+        response = await self.chain.ainvoke({"question": question, "context": context})
+        return response.content
+
+    async def astream(self, question: str, context: str):
+        async for chunk in self.chain.astream({"question": question, "context": context}):
+            if chunk.content:
+                yield chunk.content
+
+    async def astream_batch(self, questions: str, context: str, mode: str):
+        inputs = {"instructions": BATCH_INSTRUCTIONS[mode], "questions": questions, "context": context}
+        async for chunk in self.batch_chain.astream(inputs):
+            if chunk.content:
+                yield chunk.content
+
+
+_summarizer = None
+_summarizer_lock = threading.Lock()
+
+
+def get_summarizer() -> Summarizer:
+    """Return the shared Summarizer, creating it on first use."""
+    global _summarizer
+    if _summarizer is None:
+        with _summarizer_lock:
+            if _summarizer is None:
+                _summarizer = Summarizer()
+    return _summarizer
+
 
 def summarize_with_llm(question: str, context: str) -> str:
     """
@@ -14,19 +105,36 @@ def summarize_with_llm(question: str, context: str) -> str:
     Returns:
         str: The summarized answer from the LLM.
     """
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    
-
-    prompt = ChatPromptTemplate.from_messages([
-        ("system",  "You are a helpful technical assistant that answers questions using only the provided context. "
-                    "Keep responses concise, grounded in facts, and avoid speculation. Do not hallucinate or make up information."),
-        
-        ("human",   "Based on the following context, answer the question below:\n\n"
-                    "Question: {question}\n\n"
-                    "Context:\n{context}")
-    ])
-    
-    chain = prompt | llm
-    response = chain.invoke({"question": question, "context": context})
-    
-    return response.content
+    return get_summarizer().summarize(question, context)
+
+
+async def asummarize_with_llm(question: str, context: str) -> str:
+    """Async variant of `summarize_with_llm` that does not block the event loop."""
+    return await get_summarizer().asummarize(question, context)
+
+
+async def astream_summary(question: str, context: str):
+    """
+    Stream the summary as it is generated.
+
+    Yields:
+        str: Successive content tokens from the LLM.
+    """
+    async for token in get_summarizer().astream(question, context):
+        yield token
+
+
+async def astream_batch_summary(questions: str, context: str, mode: str = "per_query"):
+    """
+    Stream one answer for several questions sharing a context.
+
+    Args:
+        questions (str): Numbered list of the questions.
+        context (str): Numbered context passages.
+        mode (str): "per_query" for one section per question, "combined" for a single answer.
+
+    Yields:
+        str: Successive content tokens from the LLM.
+    """
+    async for token in get_summarizer().astream_batch(questions, context, mode):
+        yield token
@@ -0,0 +1,64 @@
+# MCP_PROJECT/utils/reranker.py
+
+import threading
+from utils import config
+
+
+class CrossEncoderReranker:
+    """
+    Local sentence-transformers cross-encoder that re-scores (query, chunk) pairs.
+
+    The model is loaded on first use, so importing this module stays cheap
+    and servers that never rerank never load it. Concurrent first requests
+    share a single load.
+    """
+
+    def __init__(self, model_name: str = None, batch_size: int = 32):
+        self.model_name = model_name or config.RERANKER_MODEL
+        self.batch_size = batch_size
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    def _load(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import CrossEncoder
+                    except ImportError as e:
+                        raise RuntimeError(f"Reranking needs sentence-transformers: {e}")
+                    self._model = CrossEncoder(self.model_name)
+        return self._model
+
+    def rerank(self, query: str, candidates: list, top_k: int) -> list:
+        """
+        Reorder retrieved chunks by cross-encoder relevance.
+
+        Args:
+            query (str): The user's query.
+            candidates (list): (text, metadata) tuples from first-stage retrieval.
+            top_k (int): Number of chunks to keep.
+
+        Returns:
+            list: The best `top_k` (text, metadata) tuples, most relevant first, with
+            the cross-encoder score as metadata["score"].
+        """
+        if not candidates:
+            return []
+        scores = self._load().predict([(query, text) for text, _ in candidates], batch_size=self.batch_size)
+        order = sorted(range(len(candidates)), key=lambda i: float(scores[i]), reverse=True)
+        return [(candidates[i][0], {**candidates[i][1], "score": float(scores[i])}) for i in order[:top_k]]
+
+
+_reranker = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> CrossEncoderReranker:
+    """Return the shared reranker, creating it on first use."""
+    global _reranker
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None:
+                _reranker = CrossEncoderReranker()
+    return _reranker
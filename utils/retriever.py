@@ -0,0 +1,382 @@
+# MCP_PROJECT/utils/retriever.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from utils import config
+from utils.concurrency import call_limited
+from utils.document_utils import iter_pdf_pages, chunk_text
+from utils.embeddings import embeddings
+from utils.lexical_index import BM25Index, reciprocal_rank_fusion
+from utils.metrics import metrics
+from utils.reranker import get_reranker
+from vector_store.factory import create_vector_store
+from vector_store.ingestion import chunk_id, chunk_metadata, sync_vector_store
+
+
+@dataclass(frozen=True)
+class Corpus:
+    """One ingested chunk set with the indexes built over it, published as a unit."""
+    store: object
+    chunks: list
+    chunks_by_id: dict
+    lexical: BM25Index
+    version: str
+
+
+class DocumentRetriever:
+    """
+    Owns the ingested corpus (vector store + chunk set) for the lifetime of the server.
+
+    Ingestion runs once, either eagerly through `start_warm_up()` when the server
+    boots or lazily on the first query. Queries afterwards only pay for the query
+    embedding and the search. `reindex()` re-runs ingestion on demand.
+
+    Besides the vector store, ingestion builds an in-process BM25 index over the
+    same chunks. In "hybrid" mode (config.RETRIEVAL_MODE) both rankings are
+    merged with reciprocal rank fusion and, if enabled, re-scored by a local
+    cross-encoder before the best `top_k` chunks are returned.
+
+    The store, chunks and BM25 index are held in one immutable `Corpus` that
+    ingestion replaces with a single assignment; each search reads it once,
+    so a re-index never mixes the old and new corpus within one request.
+    """
+
+    def __init__(self, documents_dir: str = config.DOCUMENTS_DIR):
+        self.documents_dir = documents_dir
+        self._corpus = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._warm_up_thread = None
+        self._error = None
+        self.last_sync = {}
+        # Set when serving a shared snapshot; the index must not be modified then
+        self.read_only = False
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def store(self):
+        return self._corpus.store if self._corpus else None
+
+    @property
+    def chunks(self) -> list:
+        return self._corpus.chunks if self._corpus else []
+
+    @property
+    def corpus_version(self):
+        # Changes whenever any chunk (or the embedding model) changes; keys the answer cache
+        return self._corpus.version if self._corpus else None
+
+    def _ingest(self, force=False):
+        """Load the PDFs, chunk them and make sure the index is populated."""
+        try:
+            # Pages are streamed from the parser pool straight into the chunker
+            with metrics.timer("ingest.load_and_chunk"):
+                chunks = chunk_text(iter_pdf_pages(self.documents_dir), config.CHUNK_SIZE, config.CHUNK_OVERLAP)
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"An error occurred while splitting the text: {e}")
+
+        try:
+            with metrics.timer("ingest.index_setup"):
+                # A fresh handle: the local index is loaded into a private copy, so the
+                # store being served is not modified before the swap
+                store = create_vector_store()
+            with metrics.timer("ingest.sync"):
+                self.last_sync = sync_vector_store(chunks, store, force=force)
+        except Exception as e:
+            raise RuntimeError(f"Error preparing documents: {e}")
+
+        self._activate(store, chunks)
+        metrics.incr("ingest.chunks_added", self.last_sync.get("added", 0))
+        print(f"Retriever ready with {len(chunks)} chunks.", file=sys.stderr)
+
+    def _activate(self, store, chunks):
+        """Build the in-memory lookups for a chunk set, then start serving it from `store` in one step."""
+        chunks_by_id = {}
+        for chunk in chunks:
+            chunks_by_id.setdefault(chunk_id(chunk), chunk)
+        with metrics.timer("ingest.lexical_index"):
+            lexical = BM25Index(list(chunks_by_id), [c["text"] for c in chunks_by_id.values()],
+                                k1=config.BM25_K1, b=config.BM25_B)
+        digest = hashlib.sha256(config.EMBEDDING_MODEL.encode("utf-8"))
+        for i in sorted(chunks_by_id):
+            digest.update(i.encode("utf-8"))
+
+        self._corpus = Corpus(store, chunks, chunks_by_id, lexical, digest.hexdigest()[:16])
+
+    def save_snapshot(self, path: str = None):
+        """
+        Write the ingested corpus to `path` so other processes can serve it without ingesting.
+
+        The vector index itself is already persisted by the store (the local
+        index directory, or the remote Pinecone index); the snapshot records the
+        chunks, which workers need for BM25 and result metadata.
+        """
+        path = path or config.SNAPSHOT_PATH
+        self.ensure_ready()
+        corpus = self._corpus
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "corpus_version": corpus.version,
+                "embedding_model": config.EMBEDDING_MODEL,
+                "vector_store": config.VECTOR_STORE_BACKEND,
+                "chunks": corpus.chunks,
+            }, f)
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: str = None):
+        """
+        Serve a snapshot written by `save_snapshot`, read-only.
+
+        The local vector index is memory-mapped, so every worker process
+        shares one copy of the matrix through the OS page cache. Re-indexing
+        is disabled while a snapshot is served.
+
+        Raises:
+            RuntimeError: If the snapshot is missing or was built for another embedding model or backend.
+        """
+        path = path or config.SNAPSHOT_PATH
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except OSError as e:
+            raise RuntimeError(f"Could not read corpus snapshot {path}: {e}")
+        if (snapshot.get("embedding_model") != config.EMBEDDING_MODEL
+                or snapshot.get("vector_store") != config.VECTOR_STORE_BACKEND):
+            raise RuntimeError(f"Corpus snapshot {path} was built for a different embedding model or vector store.")
+
+        with self._lock:
+            self._activate(create_vector_store(read_only=True), snapshot["chunks"])
+            self.read_only = True
+            self._ready.set()
+        print(f"Retriever serving snapshot with {len(self.chunks)} chunks (pid {os.getpid()}).", file=sys.stderr)
+
+    def warm_up(self):
+        """Run ingestion once. Subsequent calls are no-ops."""
+        with self._lock:
+            if self._ready.is_set():
+                return
+            try:
+                self._ingest()
+                self._error = None
+                self._ready.set()
+            except Exception as e:
+                self._error = e
+                raise
+
+    def start_warm_up(self):
+        """Start ingestion in a background thread so the server can accept connections meanwhile."""
+        if self._warm_up_thread is not None or self._ready.is_set():
+            return
+
+        def _run():
+            try:
+                self.warm_up()
+            except Exception as e:
+                print(f"Warm-up failed: {e}", file=sys.stderr)
+
+        self._warm_up_thread = threading.Thread(target=_run, name="retriever-warm-up", daemon=True)
+        self._warm_up_thread.start()
+
+    def ensure_ready(self, timeout: float = config.WARM_UP_TIMEOUT):
+        """
+        Block until the corpus is ingested.
+
+        If a background warm-up is running, wait for it; otherwise ingest inline.
+        A failed background warm-up is retried inline once.
+        """
+        if self._ready.is_set():
+            return
+        if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+            if not self._ready.wait(timeout):
+                raise RuntimeError("Timed out waiting for document ingestion to finish.")
+            return
+        self.warm_up()
+
+    def reindex(self, force: bool = False) -> int:
+        """
+        Re-run ingestion against the current contents of the documents folder.
+
+        Only new or changed chunks are embedded and only removed chunks are
+        deleted, unless `force` asks for a full rebuild. Queries keep being
+        answered from the current corpus meanwhile; `_activate` switches them
+        over once the new one is ready. The local index is synced in a private
+        copy; a remote (Pinecone) index is shared and updated in place, so
+        queries may see new chunks early, served from the store's metadata.
+
+        Args:
+            force (bool): Drop the index and re-embed the whole corpus.
+
+        Returns:
+            int: The number of chunks in the refreshed corpus.
+
+        Raises:
+            RuntimeError: If the retriever is serving a read-only snapshot.
+        """
+        if self.read_only:
+            raise RuntimeError("This server shares a read-only index snapshot; restart it to re-index.")
+        with self._lock:
+            try:
+                self._ingest(force=force)
+                self._error = None
+                self._ready.set()
+            except Exception as e:
+                self._error = e
+                raise
+        return len(self._corpus.chunks)
+
+    @staticmethod
+    def _candidate_count(top_k: int) -> int:
+        """How many results each first-stage retriever should return for `top_k` final chunks."""
+        if config.RETRIEVAL_MODE == "vector" and not config.RERANKER_ENABLED:
+            return top_k
+        return max(top_k, config.RETRIEVAL_CANDIDATES)
+
+    @staticmethod
+    def _hit(corpus: Corpus, item_id, stored: dict = None) -> tuple:
+        """(text, metadata) for a chunk ID, preferring the in-memory chunk over the store's copy."""
+        chunk = corpus.chunks_by_id.get(item_id)
+        if chunk is not None:
+            return chunk["text"], chunk_metadata(chunk)
+        # Indexed before this process started; older entries may lack source/page
+        return stored["text"], dict(stored)
+
+    def _rank(self, corpus: Corpus, query: str, vector_matches: list, top_k: int) -> list:
+        """
+        Merge vector matches with BM25 results and optionally rerank them.
+
+        Args:
+            corpus (Corpus): The corpus `vector_matches` were searched in.
+            query (str): The user's query, used for BM25 and the reranker.
+            vector_matches (list): Matches from the vector store, best first.
+            top_k (int): Number of chunks to return.
+
+        Returns:
+            list: (text, metadata) tuples ordered by relevance. Each metadata dict
+            carries the "score" the chunk was ranked by (cosine, BM25, fused or
+            reranker score depending on the mode).
+        """
+        hits = {}
+        rankings = []
+        if config.RETRIEVAL_MODE != "lexical":
+            for match in vector_matches:
+                hits[match.id] = self._hit(corpus, match.id, match.metadata)
+            rankings.append([(match.id, match.score) for match in vector_matches])
+
+        if config.RETRIEVAL_MODE != "vector" and corpus.lexical is not None:
+            lexical = [(item_id, score) for item_id, score in corpus.lexical.search(query, self._candidate_count(top_k))
+                       if item_id in corpus.chunks_by_id]
+            for item_id, _ in lexical:
+                hits.setdefault(item_id, self._hit(corpus, item_id))
+            rankings.append(lexical)
+
+        if not rankings:
+            return []
+        if len(rankings) == 1:
+            scored = rankings[0]
+        else:
+            scored = reciprocal_rank_fusion([[item_id for item_id, _ in ranking] for ranking in rankings],
+                                            k=config.RRF_K)
+        ranked = [(hits[item_id][0], {**hits[item_id][1], "score": float(score)}) for item_id, score in scored]
+        if config.RERANKER_ENABLED:
+            with metrics.timer("retrieval.rerank"):
+                return get_reranker().rerank(query, ranked, top_k)
+        return ranked[:top_k]
+
+    def query(self, query: str, top_k: int = config.TOP_K) -> list:
+        """
+        Return the top-k chunks for a query.
+
+        Args:
+            query (str): The user's query.
+            top_k (int): Number of matches to return.
+
+        Returns:
+            list: (text, metadata) tuples ordered by relevance.
+        """
+        self.ensure_ready()
+        corpus = self._corpus
+        matches = []
+        if config.RETRIEVAL_MODE != "lexical":
+            matches = corpus.store.query(embeddings.embed_query(query), self._candidate_count(top_k))
+        return self._rank(corpus, query, matches, top_k)
+
+    async def aembed_query(self, query: str) -> list[float]:
+        """Embed a query under the embeddings limiter."""
+        return await call_limited("embeddings", embeddings.aembed_query, query)
+
+    async def aembed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries in one request under the embeddings limiter."""
+        return await call_limited("embeddings", embeddings.aembed_documents, queries)
+
+    async def asearch(self, query_embedding, top_k: int = config.TOP_K, query: str = None) -> list:
+        """
+        Search for an already embedded query, offloaded under the vector store limiter.
+
+        Without `query` this is a plain vector search; with it, the results are
+        fused with BM25 and reranked according to config.RETRIEVAL_MODE.
+        """
+        if not self.is_ready:
+            await asyncio.to_thread(self.ensure_ready)
+        corpus = self._corpus
+        if query is None:
+            matches = await call_limited("vector_store", corpus.store.query, query_embedding, top_k)
+            hits = [self._hit(corpus, match.id, match.metadata) for match in matches]
+            return [(text, {**metadata, "score": match.score}) for (text, metadata), match in zip(hits, matches)]
+
+        matches = []
+        if config.RETRIEVAL_MODE != "lexical":
+            matches = await call_limited("vector_store", corpus.store.query, query_embedding,
+                                         self._candidate_count(top_k))
+        if config.RERANKER_ENABLED:
+            # Cross-encoder inference is CPU-bound; keep it off the event loop
+            return await asyncio.to_thread(self._rank, corpus, query, matches, top_k)
+        return self._rank(corpus, query, matches, top_k)
+
+    async def aquery(self, query: str, top_k: int = config.TOP_K) -> list:
+        """
+        Async variant of `query` for the MCP tools.
+
+        The query embedding and the vector search run under their dependency
+        limiters, so a slow upstream never blocks the event loop.
+        """
+        if not self.is_ready:
+            await asyncio.to_thread(self.ensure_ready)
+        query_embedding = None
+        if config.RETRIEVAL_MODE != "lexical":
+            query_embedding = await self.aembed_query(query)
+        return await self.asearch(query_embedding, top_k, query=query)
+
+    async def aquery_many(self, queries: list[str], top_k: int = config.TOP_K) -> list[list]:
+        """
+        Retrieve chunks for several queries with one embedding request.
+
+        The searches then run concurrently, each under the vector store limiter.
+
+        Returns:
+            list: One list of (text, metadata) tuples per query, in input order.
+        """
+        if not self.is_ready:
+            await asyncio.to_thread(self.ensure_ready)
+        query_embeddings = [None] * len(queries)
+        if config.RETRIEVAL_MODE != "lexical":
+            query_embeddings = await self.aembed_queries(queries)
+        return await asyncio.gather(*(
+            self.asearch(query_embedding, top_k, query=query)
+            for query, query_embedding in zip(queries, query_embeddings)
+        ))
+
+
+# Shared retriever used by the MCP tools
+retriever = DocumentRetriever()
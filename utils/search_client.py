@@ -0,0 +1,194 @@
+# MCP_PROJECT/utils/search_client.py
+
+import asyncio
+import queue
+import time
+from collections import OrderedDict
+from utils import config
+from utils.concurrency import call_limited
+from utils.metrics import metrics
+from utils.text import normalize_query
+
+NO_RESULTS = "No good DuckDuckGo Search Result was found"
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter: `rate` requests/second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, timeout: float):
+        """
+        Wait for a token.
+
+        Raises:
+            RuntimeError: If no token becomes available within `timeout` seconds.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        deadline = time.monotonic() + timeout
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                if time.monotonic() + wait > deadline:
+                    raise RuntimeError("Web search rate limit exceeded; try again shortly.")
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+
+
+class DuckDuckGoBackend:
+    """
+    DuckDuckGo text search over a pool of long-lived DDGS clients.
+
+    Each DDGS keeps its HTTP session (and connections) open, so searches no
+    longer pay client construction and TLS setup. Results are formatted like
+    LangChain's DuckDuckGoSearchRun.
+    """
+
+    def __init__(self, pool_size: int = None, max_results: int = None, timeout: float = None):
+        self.pool_size = pool_size or config.WEB_SEARCH_CONCURRENCY
+        self.max_results = max_results or config.WEB_SEARCH_MAX_RESULTS
+        self.timeout = timeout or config.WEB_SEARCH_TIMEOUT
+        self._pool = queue.LifoQueue()
+        self._created = 0
+
+    def _checkout(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            from duckduckgo_search import DDGS
+            self._created += 1
+            return DDGS(timeout=int(self.timeout))
+
+    def search(self, query: str) -> str:
+        ddgs = self._checkout()
+        try:
+            results = ddgs.text(query, region="wt-wt", safesearch="moderate", max_results=self.max_results)
+        finally:
+            if self._pool.qsize() < self.pool_size:
+                self._pool.put(ddgs)
+        if not results:
+            return NO_RESULTS
+        return " ".join(r["body"] for r in results)
+
+
+class FakeSearchBackend:
+    """Offline stand-in for tests and benchmarks: canned results after an optional delay."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def search(self, query: str) -> str:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return f"Fake web results for: {query}"
+
+
+class SearchClient:
+    """
+    Long-lived web search client with caching, request coalescing and rate limiting.
+
+    Results are cached per normalized query for `ttl_seconds`. Concurrent
+    searches for the same query share one upstream call, and upstream calls
+    pass through a token bucket and the web_search concurrency limiter.
+    """
+
+    def __init__(self, backend, ttl_seconds: float = None, max_entries: int = None,
+                 rate_per_second: float = None, burst: int = None, timeout: float = None):
+        self.backend = backend
+        self.ttl_seconds = config.WEB_SEARCH_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries or config.WEB_SEARCH_CACHE_MAX_ENTRIES
+        self.timeout = timeout or config.WEB_SEARCH_TIMEOUT
+        self.bucket = TokenBucket(
+            rate_per_second or config.WEB_SEARCH_RATE_PER_SECOND,
+            burst or config.WEB_SEARCH_BURST,
+        )
+        self._cache = OrderedDict()  # normalized query -> (result, fetched_at)
+        self._in_flight = {}
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        result, fetched_at = entry
+        if time.monotonic() - fetched_at > self.ttl_seconds:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    async def _fetch(self, key, query):
+        try:
+            await self.bucket.acquire(self.timeout)
+            self.upstream_calls += 1
+            result = await call_limited("web_search", self.backend.search, query)
+            self._cache[key] = (result, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def search(self, query: str) -> str:
+        key = normalize_query(query)
+        cached = self._cached(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, query))
+            self._in_flight[key] = task
+        else:
+            self.coalesced += 1
+        # Shield: one caller giving up must not cancel the search others are waiting on
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "cache_entries": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+        }
+
+
+def create_search_backend(name: str = None):
+    """Build the backend selected by config.WEB_SEARCH_BACKEND ("duckduckgo" or "fake")."""
+    name = (name or config.WEB_SEARCH_BACKEND).lower()
+    if name == "duckduckgo":
+        return DuckDuckGoBackend()
+    if name == "fake":
+        return FakeSearchBackend()
+    raise ValueError(f"Unknown web search backend: {name}")
+
+
+_search_client = None
+
+
+def get_search_client() -> SearchClient:
+    """Return the shared SearchClient, creating it on first use."""
+    global _search_client
+    if _search_client is None:
+        _search_client = SearchClient(create_search_backend())
+        metrics.register_source("web_search", _search_client.stats)
+    return _search_client
@@ -0,0 +1,8 @@
+# MCP_PROJECT/utils/text.py
+
+import re
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", query).strip().lower().rstrip("?!. ")
@@ -0,0 +1,46 @@
+# MCP_PROJECT/vector_store/base.py
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Match:
+    """A single vector search hit."""
+    id: str
+    score: float
+    metadata: dict = field(default_factory=dict)
+
+
+class VectorStore(ABC):
+    """
+    Minimal vector store interface used by ingestion and retrieval.
+
+    Vectors are passed to `upsert` as (id, values, metadata) tuples, the same
+    shape the Pinecone client accepts.
+    """
+
+    name = "vector-store"
+
+    @abstractmethod
+    def upsert(self, vectors):
+        """Insert or overwrite (id, values, metadata) tuples."""
+
+    @abstractmethod
+    def delete(self, ids):
+        """Delete vectors by ID. Unknown IDs are ignored."""
+
+    @abstractmethod
+    def delete_all(self):
+        """Delete every vector in the store."""
+
+    @abstractmethod
+    def query(self, vector, top_k: int) -> list[Match]:
+        """Return the `top_k` most similar vectors, best first."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of vectors currently stored."""
+
+    def save(self):
+        """Persist the store if it lives locally. Remote stores need nothing."""
@@ -0,0 +1,28 @@
+# MCP_PROJECT/vector_store/factory.py
+
+from utils import config
+
+
+def create_vector_store(backend=None, read_only=False):
+    """
+    Build the vector store selected by config.VECTOR_STORE_BACKEND.
+
+    Backend modules are imported on demand so the local backend runs without
+    the Pinecone SDK or network access.
+
+    Args:
+        backend (str): "pinecone" or "local". Defaults to config.VECTOR_STORE_BACKEND.
+        read_only (bool): Memory-map the local index instead of loading it into private memory.
+
+    Returns:
+        VectorStore: The selected store.
+    """
+    backend = (backend or config.VECTOR_STORE_BACKEND).lower()
+    if backend == "pinecone":
+        from vector_store.pinecone_db import PineconeVectorStore
+        return PineconeVectorStore()
+    if backend == "local":
+        from vector_store.local_db import LocalVectorStore
+        return LocalVectorStore(config.LOCAL_INDEX_PATH, index_type=config.LOCAL_INDEX_TYPE, mmap=read_only,
+                                quantization=config.LOCAL_INDEX_QUANTIZATION)
+    raise ValueError(f"Unknown vector store backend: {backend}")
@@ -0,0 +1,258 @@
+# MCP_PROJECT/vector_store/ingestion.py
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import json
+import os
+import sys
+import time
+from utils import config
+from utils.embeddings import embedding_key, embeddings
+
+# Pinecone accepts at most 1000 IDs per delete request
+DELETE_BATCH_SIZE = 1000
+
+
+def call_with_retries(fn, *args, max_retries=None, backoff=None, **kwargs):
+    """
+    Call `fn`, retrying with exponential backoff when it raises.
+
+    Args:
+        fn (callable): The function to call.
+        max_retries (int): Retries after the first attempt. Defaults to config.MAX_RETRIES.
+        backoff (float): Initial delay in seconds, doubled after every failure.
+
+    Returns:
+        Any: Whatever `fn` returns.
+    """
+    max_retries = config.MAX_RETRIES if max_retries is None else max_retries
+    delay = config.RETRY_BACKOFF_SECONDS if backoff is None else backoff
+    for attempt in range(max_retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            print(f"{getattr(fn, '__name__', 'call')} failed ({e}); retrying in {delay:.1f}s "
+                  f"[{attempt + 1}/{max_retries}]", file=sys.stderr)
+            time.sleep(delay)
+            delay *= 2
+
+
+def print_progress(done, total, elapsed):
+    """Default progress reporter for the ingestion pipeline."""
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"Embedded and upserted {done}/{total} chunks ({rate:.1f} chunks/s)", file=sys.stderr)
+
+
+def embed_and_upsert(items, store, embedding_model=None, batch_size=None, max_workers=None,
+                     upsert_batch_size=None, progress_callback=print_progress):
+    """
+    Embed items in batches with bounded concurrency and upsert them in bulk.
+
+    Embedding batches go through `embed_documents` on a thread pool of
+    `max_workers`; finished vectors are buffered and written with one
+    `store.upsert` per `upsert_batch_size` vectors. Both calls are retried
+    with backoff.
+
+    Args:
+        items (list): (id, text, metadata) tuples to index.
+        store (VectorStore): Destination store.
+        embedding_model (Embeddings): Model exposing `embed_documents`. Defaults to the shared embeddings.
+        batch_size (int): Texts per `embed_documents` call.
+        max_workers (int): Embedding batches in flight at once.
+        upsert_batch_size (int): Vectors per `store.upsert` call.
+        progress_callback (callable): Called as (done, total, elapsed_seconds) after every upsert.
+
+    Returns:
+        dict: Chunk count, elapsed seconds and throughput in chunks/s.
+    """
+    embedding_model = embedding_model or embeddings
+    batch_size = batch_size or config.EMBED_BATCH_SIZE
+    max_workers = max_workers or config.EMBED_CONCURRENCY
+    upsert_batch_size = upsert_batch_size or config.UPSERT_BATCH_SIZE
+
+    total = len(items)
+    start = time.perf_counter()
+    done = 0
+    pending = []
+
+    def flush(vectors):
+        call_with_retries(store.upsert, vectors)
+
+    batches = [items[i:i + batch_size] for i in range(0, total, batch_size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(call_with_retries, embedding_model.embed_documents, [text for _, text, _ in batch]): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            vectors = future.result()
+            pending.extend((item_id, vector, metadata) for (item_id, _, metadata), vector in zip(batch, vectors))
+
+            while len(pending) >= upsert_batch_size:
+                flush(pending[:upsert_batch_size])
+                done += upsert_batch_size
+                pending = pending[upsert_batch_size:]
+                if progress_callback:
+                    progress_callback(done, total, time.perf_counter() - start)
+
+    if pending:
+        flush(pending)
+        done += len(pending)
+        if progress_callback:
+            progress_callback(done, total, time.perf_counter() - start)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "chunks": total,
+        "seconds": elapsed,
+        "chunks_per_second": total / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def chunk_id(chunk, chunk_size=None, chunk_overlap=None):
+    """
+    Content-addressed ID for a chunk.
+
+    The ID is a hash of the chunk text, its source/page and the chunking
+    parameters, so an unchanged chunk keeps its ID across runs and any edit
+    or parameter change produces a new one.
+
+    Args:
+        chunk (dict): A chunk as produced by `chunk_text`.
+        chunk_size (int): Chunk size used to produce it. Defaults to config.CHUNK_SIZE.
+        chunk_overlap (int): Chunk overlap used to produce it. Defaults to config.CHUNK_OVERLAP.
+
+    Returns:
+        str: A 32 character hex ID.
+    """
+    chunk_size = config.CHUNK_SIZE if chunk_size is None else chunk_size
+    chunk_overlap = config.CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap
+    metadata = chunk["metadata"]
+    key = "\0".join([
+        str(metadata.get("source", "")),
+        str(metadata.get("page", "")),
+        str(chunk_size),
+        str(chunk_overlap),
+        chunk["text"],
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def chunk_metadata(chunk):
+    """
+    Metadata stored with a chunk's vector.
+
+    Source and page are top-level fields so results can be cited (and filtered)
+    without parsing; the full metadata is kept as a string as well.
+    """
+    metadata = chunk["metadata"]
+    return {
+        "text": chunk["text"],
+        "source": str(metadata.get("source", "")),
+        "page": str(metadata.get("page", "")),
+        "metadata": str(metadata),
+    }
+
+
+def load_manifest(manifest_path=None):
+    """
+    Load the local manifest of chunk IDs already present in the store.
+
+    A manifest written with a different embedding model is ignored, so the
+    store is rebuilt instead of mixing vectors from two models.
+
+    Returns:
+        dict | None: Mapping of chunk ID to source file, or None if there is no usable manifest.
+    """
+    manifest_path = manifest_path or config.INDEX_MANIFEST_PATH
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable index manifest '{manifest_path}': {e}", file=sys.stderr)
+        return None
+    model = manifest.get("embedding_model")
+    if model is not None and model != embedding_key:
+        print(f"Index manifest was built with embedding model '{model}', not '{embedding_key}'.", file=sys.stderr)
+        return None
+    return manifest.get("ids", {})
+
+
+def save_manifest(ids, manifest_path=None):
+    """Atomically write the manifest of indexed chunk IDs."""
+    manifest_path = manifest_path or config.INDEX_MANIFEST_PATH
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"updated_at": time.time(), "embedding_model": embedding_key, "ids": ids}, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def _store_count(store):
+    try:
+        return store.count()
+    except Exception:
+        return None
+
+
+def sync_vector_store(chunks, store, force=False, embedding_model=None, manifest_path=None):
+    """
+    Bring the store in line with the given chunks, embedding only what changed.
+
+    Chunks are keyed by `chunk_id`. IDs that are not in the local manifest are
+    embedded and upserted, IDs in the manifest that no longer exist are
+    deleted, and everything else is left untouched.
+
+    Args:
+        chunks (list): Chunks with metadata, as produced by `chunk_text`.
+        store (VectorStore): Destination store.
+        force (bool): Drop whatever is stored and upsert the chunks again.
+        embedding_model (Embeddings): Overrides the shared embeddings (e.g. a local fake).
+        manifest_path (str): Overrides config.INDEX_MANIFEST_PATH.
+
+    Returns:
+        dict: Counts of added, deleted and unchanged chunks.
+    """
+    manifest_path = manifest_path or config.INDEX_MANIFEST_PATH
+    current = {}
+    for chunk in chunks:
+        current.setdefault(chunk_id(chunk), chunk)
+
+    indexed = None if force else load_manifest(manifest_path)
+    stored = _store_count(store)
+    if indexed and stored == 0:
+        # The store was wiped (or a local index file removed) behind the manifest's back
+        print("Index manifest does not match an empty store. Re-indexing everything.", file=sys.stderr)
+        indexed = None
+    if indexed is None:
+        # Without a manifest we cannot tell what the store holds (first run, forced
+        # re-index or vectors written under the old positional IDs), so start clean.
+        if stored != 0:
+            print("No usable index manifest. Deleting existing vectors before upserting.", file=sys.stderr)
+            store.delete_all()
+        indexed = {}
+
+    added_ids = [i for i in current if i not in indexed]
+    stale_ids = [i for i in indexed if i not in current]
+    print(f"Index sync: {len(added_ids)} new, {len(stale_ids)} stale, "
+          f"{len(current) - len(added_ids)} unchanged chunks.", file=sys.stderr)
+
+    if added_ids:
+        items = [(i, current[i]["text"], chunk_metadata(current[i])) for i in added_ids]
+        stats = embed_and_upsert(items, store, embedding_model=embedding_model)
+        print(f"Finished upserting {stats['chunks']} embeddings in {stats['seconds']:.1f}s "
+              f"({stats['chunks_per_second']:.1f} chunks/s).", file=sys.stderr)
+
+    for start in range(0, len(stale_ids), DELETE_BATCH_SIZE):
+        call_with_retries(store.delete, stale_ids[start:start + DELETE_BATCH_SIZE])
+
+    if added_ids or stale_ids or force or not os.path.exists(manifest_path):
+        store.save()
+        save_manifest({i: str(c["metadata"].get("source", "")) for i, c in current.items()}, manifest_path)
+
+    return {"added": len(added_ids), "deleted": len(stale_ids), "unchanged": len(current) - len(added_ids)}
@@ -0,0 +1,272 @@
+# MCP_PROJECT/vector_store/local_db.py
+
+import json
+import os
+import threading
+import numpy as np
+from vector_store.base import Match, VectorStore
+
+QUANTIZED_DTYPES = {"none": np.float32, "float16": np.float16, "int8": np.int8}
+
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process cosine-similarity store persisted to a directory on disk.
+
+    Vectors are L2-normalised and kept in one float32 matrix, so a query is a
+    single matrix-vector product plus `argpartition`. The matrix is a view of
+    a preallocated buffer that doubles when full, so ingesting N vectors in
+    batches costs O(N) copies rather than O(N^2). With `index_type`
+    "faiss-flat" or "faiss-hnsw" the same matrix is mirrored into a FAISS
+    inner-product index, rebuilt lazily after writes.
+
+    `quantization` trades precision for memory: "float16" halves the matrix,
+    "int8" quarters it by storing each row as round(v * 127 / max|v|) with a
+    float32 per-row scale. Quantized rows are scored block by block in
+    float32, and FAISS indexes are built from the dequantized rows.
+
+    On disk the store is `vectors.npy` (optionally memory-mapped on load),
+    `scales.npy` for int8, and `meta.json` holding the IDs and metadata in
+    row order.
+    """
+
+    name = "local"
+
+    # Rows dequantized per step when scoring a float16 / int8 matrix
+    SCORE_BLOCK_ROWS = 8192
+    # Smallest row buffer allocated; buffers double from there
+    MIN_CAPACITY = 1024
+
+    def __init__(self, path: str, index_type: str = "numpy", mmap: bool = False, quantization: str = "none"):
+        if index_type not in ("numpy", "faiss-flat", "faiss-hnsw"):
+            raise ValueError(f"Unknown local index type: {index_type}")
+        if quantization not in QUANTIZED_DTYPES:
+            raise ValueError(f"Unknown local index quantization: {quantization}")
+        self.path = path
+        self.index_type = index_type
+        self.quantization = quantization
+        self._lock = threading.RLock()
+        self._vectors = None
+        self._scales = None
+        # Preallocated rows behind `_vectors` / `_scales`, which are views of their first len(_ids) rows
+        self._buffer = None
+        self._scale_buffer = None
+        self._ids = []
+        self._metadata = []
+        self._rows = {}
+        self._faiss_index = None
+        if os.path.exists(os.path.join(path, "meta.json")):
+            self.load(mmap=mmap)
+
+    # ---- persistence -------------------------------------------------------
+
+    def load(self, mmap: bool = False):
+        """
+        Load the store from `self.path`, memory-mapping the matrix if asked.
+
+        A matrix saved with another quantization is converted to
+        `self.quantization`, except when memory-mapped, where it is used as stored.
+        """
+        with open(os.path.join(self.path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+        vectors = np.load(os.path.join(self.path, "vectors.npy"), mmap_mode=mmap_mode)
+        stored = meta.get("quantization", "none")
+        scales = np.load(os.path.join(self.path, "scales.npy"), mmap_mode=mmap_mode) if stored == "int8" else None
+        if stored != self.quantization:
+            if mmap:
+                self.quantization = stored
+            elif len(vectors):
+                vectors, scales = self._encode(self._decode(vectors, scales))
+        with self._lock:
+            self._vectors = vectors
+            self._scales = scales
+            # Copied into growable buffers on the first write (the loaded matrix may be a read-only mmap)
+            self._buffer = self._scale_buffer = None
+            self._ids = meta["ids"]
+            self._metadata = meta["metadata"]
+            self._rows = {vector_id: row for row, vector_id in enumerate(self._ids)}
+            self._faiss_index = None
+
+    def save(self):
+        """Atomically write the matrix and metadata to `self.path`."""
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock:
+            dtype = QUANTIZED_DTYPES[self.quantization]
+            vectors = self._vectors if self._vectors is not None else np.zeros((0, 0), dtype=dtype)
+            vectors_tmp = os.path.join(self.path, "vectors.tmp.npy")
+            scales_tmp = os.path.join(self.path, "scales.tmp.npy")
+            meta_tmp = os.path.join(self.path, "meta.json.tmp")
+            np.save(vectors_tmp, np.asarray(vectors))
+            if self.quantization == "int8":
+                scales = self._scales if self._scales is not None else np.zeros(0, dtype=np.float32)
+                np.save(scales_tmp, np.asarray(scales))
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump({"ids": self._ids, "metadata": self._metadata, "quantization": self.quantization}, f)
+        os.replace(vectors_tmp, os.path.join(self.path, "vectors.npy"))
+        if self.quantization == "int8":
+            os.replace(scales_tmp, os.path.join(self.path, "scales.npy"))
+        os.replace(meta_tmp, os.path.join(self.path, "meta.json"))
+
+    # ---- writes ------------------------------------------------------------
+
+    @staticmethod
+    def _normalise(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _encode(self, matrix):
+        """Quantize normalised float32 rows. Returns (rows, per-row scales or None)."""
+        if self.quantization == "int8":
+            peaks = np.abs(matrix).max(axis=1)
+            peaks[peaks == 0] = 1.0
+            rows = np.round(matrix * (127.0 / peaks)[:, None]).astype(np.int8)
+            return rows, (peaks / 127.0).astype(np.float32)
+        return matrix.astype(QUANTIZED_DTYPES[self.quantization]), None
+
+    @staticmethod
+    def _decode(rows, scales=None):
+        """Float32 copy of (possibly quantized) rows."""
+        matrix = np.asarray(rows, dtype=np.float32)
+        return matrix * scales[:, None] if scales is not None else matrix
+
+    def _scores(self, vectors, scales, query):
+        if vectors.dtype == np.float32:
+            return vectors @ query
+        scores = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), self.SCORE_BLOCK_ROWS):
+            block = slice(start, start + self.SCORE_BLOCK_ROWS)
+            scores[block] = np.asarray(vectors[block], dtype=np.float32) @ query
+        return scores * scales if scales is not None else scores
+
+    def _reserve(self, rows: int, dimension: int, dtype, copy: bool = False):
+        """
+        Make the row buffers hold at least `rows` rows, doubling their capacity when they grow.
+
+        Rows past the published `_vectors` view are invisible to queries, so
+        they can be written in place. With `copy`, fresh buffers are allocated
+        even if there is room, for writes that overwrite published rows.
+        """
+        used = len(self._ids)
+        if not copy and self._buffer is not None and len(self._buffer) >= rows:
+            return
+        capacity = max(rows, 2 * len(self._buffer) if self._buffer is not None else 0, self.MIN_CAPACITY)
+        buffer = np.empty((capacity, dimension), dtype=dtype)
+        scale_buffer = np.empty(capacity, dtype=np.float32) if self.quantization == "int8" else None
+        if used:
+            buffer[:used] = self._vectors[:used]
+            if scale_buffer is not None:
+                scale_buffer[:used] = self._scales[:used]
+        self._buffer = buffer
+        self._scale_buffer = scale_buffer
+
+    def upsert(self, vectors):
+        if not vectors:
+            return
+        matrix, row_scales = self._encode(self._normalise(np.asarray([v[1] for v in vectors], dtype=np.float32)))
+
+        with self._lock:
+            used = len(self._ids)
+            if used == 0:
+                # An empty store takes the dimension of its first vectors
+                self._buffer = self._scale_buffer = None
+            elif self._vectors.shape[1] != matrix.shape[1]:
+                raise ValueError(f"Vector dimension {matrix.shape[1]} does not match store dimension "
+                                 f"{self._vectors.shape[1]}")
+
+            # Later occurrences of an ID win, as with successive upserts
+            targets = {}
+            for position, vector in enumerate(vectors):
+                targets[vector[0]] = position
+            added = [vector_id for vector_id in targets if vector_id not in self._rows]
+            overwrites = len(added) < len(targets)
+            # Published rows and their metadata are only rewritten in a copy, so running queries stay consistent
+            self._reserve(used + len(added), matrix.shape[1], matrix.dtype, copy=overwrites)
+            if overwrites:
+                self._metadata = list(self._metadata)
+
+            for vector_id in added:
+                self._rows[vector_id] = len(self._ids)
+                self._ids.append(vector_id)
+                self._metadata.append(None)
+            for vector_id, position in targets.items():
+                row = self._rows[vector_id]
+                self._buffer[row] = matrix[position]
+                if row_scales is not None:
+                    self._scale_buffer[row] = row_scales[position]
+                vector = vectors[position]
+                self._metadata[row] = vector[2] if len(vector) > 2 else {}
+
+            self._vectors = self._buffer[:len(self._ids)]
+            if self.quantization == "int8":
+                self._scales = self._scale_buffer[:len(self._ids)]
+            self._faiss_index = None
+
+    def delete(self, ids):
+        with self._lock:
+            doomed = {self._rows[i] for i in ids if i in self._rows}
+            if not doomed:
+                return
+            keep = [row for row in range(len(self._ids)) if row not in doomed]
+            # Fancy indexing copies, so the results are private, writable buffers
+            self._vectors = self._buffer = np.asarray(self._vectors)[keep]
+            if self._scales is not None:
+                self._scales = self._scale_buffer = np.asarray(self._scales)[keep]
+            self._ids = [self._ids[row] for row in keep]
+            self._metadata = [self._metadata[row] for row in keep]
+            self._rows = {vector_id: row for row, vector_id in enumerate(self._ids)}
+            self._faiss_index = None
+
+    def delete_all(self):
+        with self._lock:
+            self._vectors = None
+            self._scales = None
+            self._buffer = self._scale_buffer = None
+            self._ids = []
+            self._metadata = []
+            self._rows = {}
+            self._faiss_index = None
+
+    # ---- reads -------------------------------------------------------------
+
+    def _faiss(self):
+        if self._faiss_index is None:
+            import faiss
+            dimension = self._vectors.shape[1]
+            if self.index_type == "faiss-hnsw":
+                index = faiss.IndexHNSWFlat(dimension, 32, faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexFlatIP(dimension)
+            index.add(np.ascontiguousarray(self._decode(self._vectors, self._scales)))
+            self._faiss_index = index
+        return self._faiss_index
+
+    def query(self, vector, top_k: int) -> list[Match]:
+        with self._lock:
+            vectors, scales, ids, metadata = self._vectors, self._scales, self._ids, self._metadata
+            published = len(ids)
+            faiss_index = self._faiss() if self.index_type != "numpy" and published else None
+        # Later upserts append to `ids` / `metadata` in place; only their first `published` entries match `vectors`
+        if not published or top_k <= 0:
+            return []
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        k = min(top_k, published)
+
+        if faiss_index is None:
+            scores = self._scores(vectors, scales, query)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            hits = [(int(row), float(scores[row])) for row in top]
+        else:
+            distances, rows = faiss_index.search(query.reshape(1, -1), k)
+            hits = [(int(row), float(score)) for row, score in zip(rows[0], distances[0]) if row >= 0]
+
+        return [Match(id=ids[row], score=score, metadata=metadata[row]) for row, score in hits]
+
+    def count(self) -> int:
+        return len(self._ids)
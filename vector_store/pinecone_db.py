@@ -3,81 +3,93 @@
 from pinecone import Pinecone, ServerlessSpec
 from pinecone.exceptions import PineconeException
 import os
-from dotenv import load_dotenv
-from utils.document_utils import chunk_text
-from utils.embeddings import embeddings
-
-load_dotenv()
-CHUNK_SIZE = int(os.getenv("CHUNK_SIZE"))
-CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP"))
-
+import sys
+from utils import config
+from utils.embeddings import embedding_dimension
+from vector_store.base import Match, VectorStore
+from vector_store.ingestion import sync_vector_store
 
 
 def create_pinecone_index():
     """
     Create a Pinecone index if it does not already exist.
-    
+
+    The index dimension is taken from the configured embedding model.
+
     Returns:
         Index: A Pinecone index object.
+
+    Raises:
+        RuntimeError: If an existing index has a different dimension than the embedding model.
     """
     pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-    index_name = "agentic-rag-pinecone"
+    index_name = config.PINECONE_INDEX_NAME
+    dimension = embedding_dimension()
 
-    if index_name not in pc.list_indexes():
+    if index_name not in pc.list_indexes().names():
         try:
             pc.create_index(
                 name=index_name,
-                dimension=1536,
+                dimension=dimension,
                 metric="cosine",
                 spec=ServerlessSpec(cloud="aws", region="us-east-1")
             )
-            print(f"Index '{index_name}' created.")
+            print(f"Index '{index_name}' created.", file=sys.stderr)
         except PineconeException as e:
             if e.status == 409:  # Conflict error, index already exists
-                print(f"Index '{index_name}' already exists.")
-            else: 
-                raise e  
+                print(f"Index '{index_name}' already exists.", file=sys.stderr)
+            else:
+                raise e
     else:
-        print(f"Index '{index_name}' already exists.")
+        print(f"Index '{index_name}' already exists.", file=sys.stderr)
+        existing = pc.describe_index(index_name).dimension
+        if existing != dimension:
+            raise RuntimeError(
+                f"Index '{index_name}' has dimension {existing}, but embedding model "
+                f"'{config.EMBEDDING_MODEL}' produces {dimension}. Use another PINECONE_INDEX_NAME or delete the index."
+            )
 
     index = pc.Index(index_name)
     return index
 
 
-def upsert_data_to_pinecone(documents, full_text, index):
-    """
-    Upsert the text chunks and their embeddings into the Pinecone index.
-    
-    Args:
-        documents (list): A list of documents.
-        full_text (str): The full text to be split into chunks.
-        index (Index): A Pinecone index object.
-    """
+class PineconeVectorStore(VectorStore):
+    """VectorStore backed by a remote Pinecone index."""
 
-    try:
-        chunks = chunk_text(documents, full_text, CHUNK_SIZE, CHUNK_OVERLAP)
-    except Exception as e:
-        raise RuntimeError(f"An error occurred while splitting the text: {e}")
-    
-    # Check if data has already been upserted with the same chunk size
-    upserted_flag_id = "upserted_flag"
-    response = index.fetch(ids=[upserted_flag_id])
-    if response and upserted_flag_id in response.vectors:
-        stored_chunk_size = response.vectors[upserted_flag_id]["metadata"].get("chunk_size")
-        if stored_chunk_size == CHUNK_SIZE:
-            print("Data already upserted with the same chunk size. Skipping upsert.")
-        else:
-            print("Chunk size has changed. Deleting existing vectors and upserting new ones.")
-            index.delete(delete_all=True)
-    else:
-        print("No existing data found. Proceeding with upsert.")
+    name = "pinecone"
+
+    def __init__(self, index=None):
+        self.index = index if index is not None else create_pinecone_index()
 
-    # Upsert embeddings into the Pinecone index
-    if not response or upserted_flag_id not in response.vectors or stored_chunk_size != CHUNK_SIZE:
-        for i, chunk in enumerate(chunks):
-            chunk_embedding = embeddings.embed_query(chunk["text"])
-            index.upsert([(str(i), chunk_embedding, {"text": chunk["text"], "metadata": str(chunk["metadata"])})])
+    def upsert(self, vectors):
+        self.index.upsert(vectors=vectors)
 
-        # Upsert a flag to indicate data has been upserted, including the chunk size
-        index.upsert([(upserted_flag_id, [0.1] * 1536, {"text": "upserted_flag", "chunk_size": CHUNK_SIZE})])
-        print("Finished upserting embeddings.")
+    def delete(self, ids):
+        self.index.delete(ids=ids)
+
+    def delete_all(self):
+        self.index.delete(delete_all=True)
+
+    def query(self, vector, top_k: int) -> list[Match]:
+        response = self.index.query(vector=vector, top_k=top_k, include_metadata=True)
+        return [Match(id=m.id, score=m.score, metadata=m.metadata or {}) for m in response.matches]
+
+    def count(self) -> int:
+        return self.index.describe_index_stats().total_vector_count
+
+
+def upsert_data_to_pinecone(chunks, index, force=False, embedding_model=None, manifest_path=None):
+    """
+    Sync chunks into a Pinecone index. See `vector_store.ingestion.sync_vector_store`.
+
+    Args:
+        chunks (list): Chunks with metadata, as produced by `chunk_text`.
+        index (Index | PineconeVectorStore): A Pinecone index object or an existing store wrapper.
+        force (bool): Drop whatever is stored and upsert the chunks again.
+
+    Returns:
+        dict: Counts of added, deleted and unchanged chunks.
+    """
+    store = index if isinstance(index, VectorStore) else PineconeVectorStore(index)
+    return sync_vector_store(chunks, store, force=force, embedding_model=embedding_model,
+                             manifest_path=manifest_path)